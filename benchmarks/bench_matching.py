@@ -0,0 +1,87 @@
+# ================================
+# 🧮 Benchmark توسع مطابقة الأماكن مع عدد الأنوية
+# ================================
+# بيبني gazetteer اصطناعي بحجم قابل للضبط، وبيقيس عدد الاستعلامات بالثانية
+# (difflib + cosine) لكل حجم process pool، مع عدة threads عم تبعت بنفس الوقت
+# متل ما بيصير تحت uvicorn.
+#
+# مثال:
+#   python -m benchmarks.bench_matching --places 20000 --queries 400 --pool-sizes 0,1,2,4,8
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from matching_pool import PlaceMatcher
+
+SYLLABLES = ["با", "ب", "تو", "ما", "بر", "مك", "ة", "مز", "ال", "قص", "اع", "شر", "قي", "حم", "يد", "ية",
+             "سو", "ق", "جا", "مع", "دي", "ن", "ركن", "مه", "جر", "ين", "شعل", "ان", "كفر", "سوس"]
+PREFIXES = ["", "شارع ", "سوق ", "حي ", "ساحة ", "جامع "]
+
+
+def synthetic_names(count: int, rng: random.Random):
+    names = set()
+    while len(names) < count:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        names.add(rng.choice(PREFIXES) + word)
+    return sorted(names)
+
+
+def typo(name: str, rng: random.Random) -> str:
+    if len(name) < 4:
+        return name
+    i = rng.randrange(len(name))
+    return name[:i] + name[i + 1:]
+
+
+def run(matcher: PlaceMatcher, queries, vectors, clients: int, mode: str) -> float:
+    def one(i):
+        if mode in ("difflib", "mixed"):
+            matcher.close_matches(queries[i], n=1, cutoff=0.6)
+        if mode in ("cosine", "mixed"):
+            matcher.best_embedding_match(vectors[i])
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(one, range(len(queries))))
+    return len(queries) / (time.perf_counter() - t0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Matching throughput vs process pool size")
+    parser.add_argument("--places", type=int, default=5000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--pool-sizes", default=",".join(str(n) for n in sorted({0, 1, 2, 4, os.cpu_count() or 1})))
+    parser.add_argument("--clients", type=int, default=0, help="concurrent submitting threads (default: 2x pool)")
+    parser.add_argument("--mode", choices=["difflib", "cosine", "mixed"], default="mixed")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    names = synthetic_names(args.places, rng)
+    matrix = np.random.default_rng(args.seed).standard_normal((len(names), args.dim), dtype=np.float32)
+    picks = [rng.randrange(len(names)) for _ in range(args.queries)]
+    queries = [typo(names[i], rng) for i in picks]
+    vectors = [matrix[i] + np.random.default_rng(i).standard_normal(args.dim, dtype=np.float32) * 0.3 for i in picks]
+
+    print(f"places={len(names)} dim={args.dim} queries={args.queries} mode={args.mode} cpus={os.cpu_count()}")
+    print(f"{'pool':>6}{'clients':>9}{'q/s':>10}{'speedup':>9}")
+    baseline = None
+    for size in [int(x) for x in args.pool_sizes.split(",") if x.strip()]:
+        matcher = PlaceMatcher(names, matrix, pool_size=size)
+        try:
+            matcher.warm_up()
+            clients = args.clients or max(1, size) * 2
+            qps = run(matcher, queries, vectors, clients, args.mode)
+        finally:
+            matcher.close()
+        baseline = baseline or qps
+        print(f"{size:>6}{clients:>9}{qps:>10.1f}{qps / baseline:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# ================================
+# 🔤 Benchmark دقة الـ embedding المحلي (n-grams) على استعلامات معلمة
+# ================================
+# الاستعلامات بـ benchmarks/data/place_queries.jsonl: كل سطر فيه الاستعلام والمكان
+# الصح بالـ gazetteer (أو null إذا المكان مو موجود، وهون لازم نصعّد لـ OpenAI/Pinecone).
+# بينضاف عليهم أخطاء كتابة مولدة من أسماء الـ gazetteer (همزات، تاء مربوطة،
+# حذف حرف، تبديل حرفين). لكل عتبة ثقة منطبع:
+#   coverage:  نسبة الاستعلامات الموجودة يلي انحلت محلياً بدون شبكة
+#   precision: من يلي انحلت محلياً، قديش كان أول جواب صح
+#   false accept: نسبة الاستعلامات يلي مو موجودة وانقبلت غلط
+# مرة بالتشابه لحاله، ومرة مع شرط تغطية كلمات الاستعلام (--coverage، متل ngram_search).
+#
+# مثال:
+#   python -m benchmarks.bench_ngram_recall --thresholds 0.7,0.8,0.85,0.9 --floor 0.5 --margin 0.15 --coverage 1
+import argparse
+import json
+import os
+import random
+import time
+
+from cities import load_cities
+from gazetteer import load_gazetteer
+from ngram_embedder import NgramEmbedder, NgramIndex, is_confident
+
+QUERIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "place_queries.jsonl")
+SWAPS = [("ة", "ه"), ("أ", "ا"), ("إ", "ا"), ("ي", "ى"), ("ال", "")]
+
+
+def load_queries(path: str = QUERIES_PATH):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def typo_variants(names, rng: random.Random, per_name: int):
+    rows = []
+    for name in names:
+        for _ in range(per_name):
+            q = name
+            kind = rng.randrange(3)
+            if kind == 0:
+                for a, b in SWAPS:
+                    if a in q:
+                        q = q.replace(a, b, 1)
+                        break
+            elif kind == 1 and len(q) > 4:
+                i = rng.randrange(1, len(q) - 1)
+                q = q[:i] + q[i + 1:]
+            elif len(q) > 4:
+                i = rng.randrange(1, len(q) - 2)
+                q = q[:i] + q[i + 1] + q[i] + q[i + 2:]
+            rows.append({"query": q, "expected": name})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tier-0 n-gram place search: recall and escalation rate")
+    parser.add_argument("--queries", default=QUERIES_PATH)
+    parser.add_argument("--typos-per-name", type=int, default=2)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--thresholds", default="0.6,0.65,0.7,0.75,0.8,0.85,0.9")
+    parser.add_argument("--floor", type=float, default=0.5, help="lowest score accepted on margin alone")
+    parser.add_argument("--margin", type=float, default=0.15, help="lead over the runner-up (1 disables)")
+    parser.add_argument("--coverage", type=float, default=1.0, help="share of query words matched in the name")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    gazetteer = load_gazetteer()
+    t0 = time.perf_counter()
+    damascus = next(c for c in load_cities() if c.key == "damascus")
+    index = NgramIndex(list(gazetteer), NgramEmbedder(dim=args.dim, stop_words=damascus.stop_words))
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    rows = load_queries(args.queries) + typo_variants(list(gazetteer), random.Random(args.seed), args.typos_per_name)
+    t0 = time.perf_counter()
+    results = [(row, index.search(row["query"], top_k=3)) for row in rows]
+    per_query_us = (time.perf_counter() - t0) / len(rows) * 1e6
+
+    known = [(row, top) for row, top in results if row["expected"]]
+    unknown = [(row, top) for row, top in results if not row["expected"]]
+    recall1 = sum(top[0][0] == row["expected"] for row, top in known) / len(known)
+    recall3 = sum(row["expected"] in [n for n, _ in top] for row, top in known) / len(known)
+
+    print(f"gazetteer={len(gazetteer)} dim={args.dim} build={build_ms:.1f}ms  query={per_query_us:.0f}us")
+    print(f"queries: {len(known)} in gazetteer, {len(unknown)} out of gazetteer")
+    print(f"recall@1={recall1:.3f} recall@3={recall3:.3f}")
+    print(f"floor={args.floor} margin={args.margin} token coverage>={args.coverage}")
+    print(f"{'threshold':>10}{'coverage':>10}{'precision':>11}{'false accept':>14}"
+          f"{'+tokens: coverage':>19}{'precision':>11}{'false accept':>14}")
+    for threshold in (float(t) for t in args.thresholds.split(",")):
+        confident = lambda top: is_confident(top, threshold, args.floor, args.margin)
+        covered = lambda row, top: (confident(top)
+                                    and index.coverage(row["query"], top[0][0]) >= args.coverage)
+        line = f"{threshold:>10.2f}"
+        for accept, width in ((lambda row, top: confident(top), 10), (covered, 19)):
+            answered = [(row, top) for row, top in known if accept(row, top)]
+            correct = sum(top[0][0] == row["expected"] for row, top in answered)
+            false_accept = sum(accept(row, top) for row, top in unknown)
+            line += (f"{len(answered) / len(known):>{width}.3f}"
+                     f"{(correct / len(answered) if answered else 0):>11.3f}"
+                     f"{(false_accept / len(unknown) if unknown else 0):>14.3f}")
+        print(line)
+    misses = [(row["query"], row["expected"], top[0]) for row, top in known if top[0][0] != row["expected"]]
+    for query, expected, (got, score) in misses[:10]:
+        print(f"  miss: {query!r} → {got!r} ({score:.2f}), expected {expected!r}")
+
+
+if __name__ == "__main__":
+    main()
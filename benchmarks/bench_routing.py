@@ -0,0 +1,164 @@
+# ================================
+# 🛣️ Benchmark التوجيه المحلي مقابل Google Directions
+# ================================
+# بيقيس زمن الاستعلام (أول مرة وبعد الكاش) على شبكة الطرق المحلية، ودقة
+# المسافة والزمن مقارنة بنتائج Directions مسجلة (JSONL)، ومعها التقدير القديم
+# (الخط المستقيم × 1.3 و 4 دقائق لكل كم) للمقارنة.
+#
+# كل سطر بملف التسجيل:
+#   {"origin": [lat, lng], "destination": [lat, lng], "distance_m": 5230, "duration_s": 840}
+#
+# أمثلة:
+#   # تسجيل 200 زوج عشوائي ضمن حدود الشبكة من Directions (بيحتاج GOOGLE_MAPS_API_KEY)
+#   python -m benchmarks.bench_routing --graph damascus_roads.npz --record directions.jsonl --pairs 200
+#   # الدقة والزمن مقابل التسجيل
+#   python -m benchmarks.bench_routing --graph damascus_roads.npz --directions directions.jsonl
+#   # بدون بيانات: شبكة اصطناعية لقياس الزمن فقط
+#   python -m benchmarks.bench_routing --synthetic 300
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+
+import numpy as np
+import requests
+
+from road_routing import RoadGraph, DRIVE_SPEEDS_KMH, _haversine_m
+
+ROAD_DISTANCE_FACTOR = 1.3
+MINUTES_PER_KM = 4
+DAMASCUS = (33.5138, 36.2765)
+
+
+def synthetic_grid(size: int, spacing_m: float = 120.0, seed: int = 5) -> RoadGraph:
+    # شبكة شوارع size×size حول دمشق، كل عاشر شارع رئيسي، وشوية عقد مزاحة وشوارع مقطوعة
+    rng = np.random.default_rng(seed)
+    dlat = spacing_m / 111000
+    dlng = spacing_m / (111000 * np.cos(np.radians(DAMASCUS[0])))
+    ys, xs = np.divmod(np.arange(size * size), size)
+    lat = DAMASCUS[0] + (ys - size / 2) * dlat + rng.normal(0, dlat / 8, size * size)
+    lng = DAMASCUS[1] + (xs - size / 2) * dlng + rng.normal(0, dlng / 8, size * size)
+    src, dst, speed = [], [], []
+    for y in range(size):
+        for x in range(size):
+            n = y * size + x
+            for nb, main_road in ((n + 1, y % 10 == 0) if x + 1 < size else (None, False),
+                                  (n + size, x % 10 == 0) if y + 1 < size else (None, False)):
+                if nb is None or (not main_road and rng.random() < 0.05):
+                    continue
+                kmh = DRIVE_SPEEDS_KMH["primary" if main_road else "residential"]
+                src += [n, nb]
+                dst += [nb, n]
+                speed += [kmh, kmh]
+    src, dst = np.asarray(src), np.asarray(dst)
+    length = _haversine_m(lat[src], lng[src], lat[dst], lng[dst])
+    return RoadGraph.from_edges(lat, lng, src, dst, length, length / (np.asarray(speed) / 3.6))
+
+
+def graph_bounds(graph: RoadGraph):
+    lat = np.frombuffer(graph._lat, dtype=np.float64)
+    lng = np.frombuffer(graph._lng, dtype=np.float64)
+    return np.percentile(lat, [5, 95]), np.percentile(lng, [5, 95])
+
+
+def random_pairs(graph: RoadGraph, count: int, rng: random.Random):
+    (lat_lo, lat_hi), (lng_lo, lng_hi) = graph_bounds(graph)
+    point = lambda: [rng.uniform(lat_lo, lat_hi), rng.uniform(lng_lo, lng_hi)]
+    return [{"origin": point(), "destination": point()} for _ in range(count)]
+
+
+def record_directions(pairs, out_path: str):
+    base = os.getenv("GOOGLE_MAPS_BASE_URL", "https://maps.googleapis.com")
+    key = os.getenv("GOOGLE_MAPS_API_KEY", "")
+    written = 0
+    with open(out_path, "w", encoding="utf-8") as f:
+        for pair in pairs:
+            o, d = pair["origin"], pair["destination"]
+            data = requests.get(
+                f"{base}/maps/api/directions/json?origin={o[0]},{o[1]}&destination={d[0]},{d[1]}"
+                f"&mode=driving&region=SY&key={key}"
+            ).json()
+            if data.get("status") != "OK" or not data.get("routes"):
+                continue
+            leg = data["routes"][0]["legs"][0]
+            f.write(json.dumps({**pair, "distance_m": leg["distance"]["value"], "duration_s": leg["duration"]["value"]}) + "\n")
+            written += 1
+    print(f"recorded {written}/{len(pairs)} routes → {out_path}")
+
+
+def percentiles(values):
+    values = sorted(values)
+    pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+    return f"p50={pick(0.5):.2f}ms p95={pick(0.95):.2f}ms p99={pick(0.99):.2f}ms"
+
+
+def mape(estimates, truth):
+    pairs = [(e, t) for e, t in zip(estimates, truth) if e is not None and t]
+    if not pairs:
+        return float("nan")
+    return 100 * statistics.mean(abs(e - t) / t for e, t in pairs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local road-graph routing: latency and accuracy vs Directions")
+    parser.add_argument("--graph", help="road graph .npz (from build_road_graph.py)")
+    parser.add_argument("--synthetic", type=int, default=0, help="use a synthetic NxN grid instead of --graph")
+    parser.add_argument("--directions", help="recorded Directions JSONL to compare against")
+    parser.add_argument("--record", help="record Directions results for random pairs into this JSONL")
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        graph = synthetic_grid(args.synthetic)
+    elif args.graph:
+        t0 = time.perf_counter()
+        graph = RoadGraph.load(args.graph)
+        print(f"load: {(time.perf_counter() - t0) * 1000:.0f}ms")
+    else:
+        parser.error("--graph or --synthetic is required")
+    print(f"graph: {graph.node_count} nodes, {graph.edge_count} edges, {graph.memory_bytes() / 1e6:.1f} MB")
+
+    rng = random.Random(args.seed)
+    if args.record:
+        record_directions(random_pairs(graph, args.pairs, rng), args.record)
+        return
+    if args.directions:
+        with open(args.directions, encoding="utf-8") as f:
+            pairs = [json.loads(line) for line in f if line.strip()]
+    else:
+        pairs = random_pairs(graph, args.pairs, rng)
+
+    results, cold, warm = [], [], []
+    for pair in pairs:
+        t0 = time.perf_counter()
+        results.append(graph.route(*pair["origin"], *pair["destination"]))
+        cold.append((time.perf_counter() - t0) * 1000)
+    for pair in pairs:
+        t0 = time.perf_counter()
+        graph.route(*pair["origin"], *pair["destination"])
+        warm.append((time.perf_counter() - t0) * 1000)
+
+    routed = sum(1 for r in results if r)
+    print(f"routed: {routed}/{len(pairs)}")
+    print(f"latency cold: {percentiles(cold)}")
+    print(f"latency warm: {percentiles(warm)}")
+    print(f"cache: {graph.stats()}")
+
+    if args.directions:
+        truth_km = [p["distance_m"] / 1000 for p in pairs]
+        truth_min = [p["duration_s"] / 60 for p in pairs]
+        straight_km = [
+            float(_haversine_m(*p["origin"], *p["destination"])) / 1000 * ROAD_DISTANCE_FACTOR for p in pairs
+        ]
+        print(f"{'source':<14}{'distance MAPE':>16}{'duration MAPE':>16}")
+        print(f"{'road_graph':<14}{mape([r[0] if r else None for r in results], truth_km):>15.1f}%"
+              f"{mape([r[1] if r else None for r in results], truth_min):>15.1f}%")
+        print(f"{'haversine':<14}{mape(straight_km, truth_km):>15.1f}%"
+              f"{mape([km * MINUTES_PER_KM for km in straight_km], truth_min):>15.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# ================================
+# 🗂️ Benchmark حجم الجلسة الواحدة
+# ================================
+# بيقارن الشكل القديم (dict حر فيه الـ prompt ونتائج البحث وكتالوج السيارات)
+# مع Session بـ __slots__: البايتات بالذاكرة لكل جلسة (tracemalloc) وحجم
+# الجلسة بعد التحويل لـ JSON لمخزن خارجي.
+#
+# مثال:
+#   python -m benchmarks.bench_session_memory --sessions 20000
+import argparse
+import ast
+import json
+import os
+import random
+import tracemalloc
+
+from benchmarks.stubs import STUB_CAR_TYPES, STUB_PLACES
+from session_state import Session, place_choices
+
+MAIN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+
+def load_assistant_prompt() -> str:
+    # منقرا الـ prompt من main.py بدون ما نستورده: الاستيراد ما بيتصل بشي (الاتصالات
+    # بالـ lifespan)، بس بيبني OpenAI client (بدو OPENAI_API_KEY) وبيحمّل كل تبعيات الخدمة
+    with open(MAIN_PATH, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", "") == "ASSISTANT_PROMPT" for t in node.targets):
+            return ast.literal_eval(node.value)
+    return ""
+
+
+def search_results(rng: random.Random):
+    return [
+        {"description": f"{name}، دمشق، سوريا", "place_id": f"pinecone_{name}", "is_pinecone": True}
+        for name in rng.sample(STUB_PLACES, 3)
+    ]
+
+
+def legacy_session(rng, prompt, car_types, dest_results, pickup_results):
+    # نفس شكل الجلسة قبل Session (عند خطوة confirm_booking)
+    return {
+        "lat": 33.5138 + rng.random() / 100,
+        "lng": 36.2765 + rng.random() / 100,
+        "step": "confirm_booking",
+        "history": [
+            {"role": "system", "content": prompt},
+            {"role": "assistant", "content": "وين بدك أوصلك اليوم؟"},
+        ],
+        "loc_txt": "شارع بغداد، دمشق",
+        "last_places": [],
+        "possible_places": dest_results[:5],
+        "chosen_place": {"address": dest_results[0]["description"], "lat": 33.51, "lng": 36.29},
+        "to_lat": 33.51,
+        "to_lng": 36.29,
+        "possible_pickup_places": pickup_results[:5],
+        "pickup": pickup_results[0]["description"],
+        "pickup_lat": 33.52,
+        "pickup_lng": 36.27,
+        "time": None,
+        "Start_at": "2026-01-01T10:30:00",
+        "car": "VIP",
+        "car_types": car_types,
+        "car_id": 2,
+        "audio": "قرآن",
+        "notes": "",
+        "distance_km": 6.42,
+        "estimated_price": 51360.0,
+    }
+
+
+def slots_session(rng, car_types, dest_results, pickup_results):
+    sess = Session(33.5138 + rng.random() / 100, 36.2765 + rng.random() / 100, "شارع بغداد، دمشق", "confirm_booking")
+    sess.add_message("assistant", "وين بدك أوصلك اليوم؟")
+    sess.possible_places = place_choices(dest_results[:5])
+    sess.dest_address = dest_results[0]["description"]
+    sess.to_lat, sess.to_lng = 33.51, 36.29
+    sess.possible_pickup_places = place_choices(pickup_results[:5])
+    sess.pickup = pickup_results[0]["description"]
+    sess.pickup_lat, sess.pickup_lng = 33.52, 36.27
+    sess.start_at = "2026-01-01T10:30:00"
+    sess.car = "VIP"
+    sess.car_type_ids = tuple(c["Id"] for c in car_types)
+    sess.car_id = 2
+    sess.audio = "قرآن"
+    sess.distance_km = 6.42
+    sess.estimated_price = 51360.0
+    return sess
+
+
+def measure(build, count: int):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = {f"s{i}": build(i) for i in range(count)}
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return store, (after - before) / count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bytes per session: legacy dict vs __slots__ Session")
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    prompt = load_assistant_prompt()
+    rng = random.Random(args.seed)
+    # نتائج البحث ونسخة الكتالوج مشتركة بين الجلسات متل الكاش بالعملية الواحدة
+    shared_results = [search_results(rng) for _ in range(50)]
+    car_types = [dict(c) for c in STUB_CAR_TYPES]
+
+    def build_legacy(i):
+        return legacy_session(rng, prompt, car_types, shared_results[i % 50], shared_results[(i + 7) % 50])
+
+    def build_slots(i):
+        return slots_session(rng, car_types, shared_results[i % 50], shared_results[(i + 7) % 50])
+
+    legacy_store, legacy_bytes = measure(build_legacy, args.sessions)
+    slots_store, slots_bytes = measure(build_slots, args.sessions)
+
+    legacy_json = sum(len(json.dumps(s, ensure_ascii=False).encode("utf-8")) for s in legacy_store.values()) / args.sessions
+    slots_json = sum(len(json.dumps(s.to_dict(), ensure_ascii=False).encode("utf-8")) for s in slots_store.values()) / args.sessions
+
+    # التأكد إنو الجلسة بترجع نفسها بعد JSON
+    sample = next(iter(slots_store.values()))
+    restored = Session.from_dict(json.loads(json.dumps(sample.to_dict())))
+    assert restored.to_dict() == sample.to_dict()
+
+    print(f"sessions={args.sessions}")
+    print(f"{'layout':<10}{'bytes/session (memory)':>26}{'bytes/session (json)':>24}")
+    print(f"{'dict':<10}{legacy_bytes:>26.0f}{legacy_json:>24.0f}")
+    print(f"{'slots':<10}{slots_bytes:>26.0f}{slots_json:>24.0f}")
+    print(f"memory saving: {100 * (1 - slots_bytes / legacy_bytes):.1f}%  "
+          f"json saving: {100 * (1 - slots_json / legacy_json):.1f}%")
+
+
+if __name__ == "__main__":
+    main()
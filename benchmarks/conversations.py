@@ -0,0 +1,126 @@
+# ================================
+# 💬 محادثات حجز واقعية لإعادة تشغيلها على /chatbot
+# ================================
+# كل محادثة عبارة عن قيم الخانات (الوجهة، الانطلاق، الوقت...) والـ driver
+# بيختار الرسالة المناسبة حسب خطوة الجلسة الحالية.
+import random
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+DESTINATIONS = [
+    "باب توما", "البرامكة", "المزة القديمة", "أبو رمانة", "المالكي", "القصاع",
+    "باب شرقي", "سوق الحميدية", "ساحة الأمويين", "كفرسوسة", "مشروع دمر",
+    "شارع بغداد", "مستشفى المواساة", "جامعة دمشق كلية الهندسة", "الشعلان",
+    "بدي روح عالبرامكة", "خدني على باب توما لو سمحت", "مول قاسيون", "ركن الدين",
+]
+
+PICKUPS = ["موقعي", "موقعي الحالي", "الجلاء", "المالكي", "شارع الثورة", "الميدان"]
+
+TIMES = ["الآن", "الحين", "بعد 10 دقايق", "بعد 20 دقيقة", "الساعة 8 م", "9:30"]
+
+CAR_TEXTS = ["VIP", "عادية", "أي نوع", "سيارة مريحة"]
+
+AUDIO = ["قرآن", "موسيقى", "بدون", "أغاني لو سمحت", "صمت"]
+
+NOTES = ["لا يوجد", "عندي شنط كثيرة", "لا تدخن لو سمحت", "اتصل فيني لما توصل"]
+
+CHATTER = ["مرحبا كيفك", "شكرا", "شو أخبارك", "من أنت؟"]
+
+CONFIRM = ["نعم", "أكد", "موافق"]
+
+# رسالة أولى فيها كذا خانة، متل "بدي روح عالبرامكة من موقعي بعد 10 دقايق VIP"
+ONE_SHOT_VERBS = ["بدي روح", "خدني", "وديني", ""]
+ONE_SHOT_TIMES = ["هلق", "الآن", "بعد 10 دقايق", "بعد 20 دقيقة", "الساعة 8 م", "الساعة 9:30"]
+ONE_SHOT_CARS = ["VIP", "سيارة عادية", "سيارة عائلية"]
+ONE_SHOT_AUDIO = ["مع قرآن", "بدون موسيقى", "مع أغاني"]
+
+# إحداثيات انطلاق ضمن دمشق
+START_POINTS = [
+    (33.5138, 36.2765), (33.5020, 36.2470), (33.5300, 36.2920),
+    (33.4950, 36.3010), (33.5230, 36.2600), (33.4870, 36.2390),
+]
+
+
+@dataclass
+class Conversation:
+    lat: float
+    lng: float
+    destination: str
+    pickup: str
+    time: str
+    car_text: str
+    car_choice: str
+    audio: str
+    notes: str
+    confirm: str
+    # رسائل خارج السياق منحطها قبل خطوات معينة
+    chatter_before: dict = field(default_factory=dict)
+    # لو محددة، المستخدم بيترك المحادثة عند هي الخطوة (الجلسة بتضل بالذاكرة)
+    abandon_at: Optional[str] = None
+    # لو محددة، هي أول رسالة بدل الوجهة لحالها
+    one_shot: Optional[str] = None
+
+    def message_for_step(self, step: str) -> str:
+        if step == "ask_destination":
+            return self.one_shot or self.destination
+        if step in ("choose_destination", "choose_pickup"):
+            return "1"
+        if step == "ask_pickup":
+            return self.pickup
+        if step == "ask_time":
+            return self.time
+        if step == "ask_car_type":
+            return self.car_text
+        if step == "choose_car_type":
+            return self.car_choice
+        if step == "ask_audio":
+            return self.audio
+        if step == "ask_notes":
+            return self.notes
+        if step == "confirm_booking":
+            return self.confirm
+        return self.destination
+
+
+def one_shot_message(rng: random.Random, destination: str, pickup: str) -> str:
+    marker = "ع" if destination.startswith("ال") else "على "
+    parts = [rng.choice(ONE_SHOT_VERBS), marker + destination]
+    extras = [
+        "من موقعي" if pickup.startswith("موقعي") else f"من {pickup}",
+        rng.choice(ONE_SHOT_TIMES),
+        rng.choice(ONE_SHOT_CARS),
+        rng.choice(ONE_SHOT_AUDIO),
+    ]
+    parts += rng.sample(extras, rng.randint(1, len(extras)))
+    return " ".join(p for p in parts if p)
+
+
+ABANDON_STEPS = ["ask_pickup", "ask_time", "choose_car_type", "ask_notes", "confirm_booking"]
+
+
+def generate_conversations(count: int, seed: int = 42, chatter_rate: float = 0.15,
+                           abandon_rate: float = 0.1, oneshot_rate: float = 0.0) -> List[Conversation]:
+    rng = random.Random(seed)
+    convs = []
+    for _ in range(count):
+        lat, lng = rng.choice(START_POINTS)
+        conv = Conversation(
+            lat=lat + rng.uniform(-0.005, 0.005),
+            lng=lng + rng.uniform(-0.005, 0.005),
+            destination=rng.choice(DESTINATIONS),
+            pickup=rng.choice(PICKUPS),
+            time=rng.choice(TIMES),
+            car_text=rng.choice(CAR_TEXTS),
+            car_choice=str(rng.randint(1, 2)),
+            audio=rng.choice(AUDIO),
+            notes=rng.choice(NOTES),
+            confirm=rng.choice(CONFIRM),
+        )
+        if rng.random() < chatter_rate:
+            conv.chatter_before[rng.choice(["ask_destination", "ask_time", "ask_audio"])] = rng.choice(CHATTER)
+        if rng.random() < abandon_rate:
+            conv.abandon_at = rng.choice(ABANDON_STEPS)
+        if rng.random() < oneshot_rate and not conv.destination.startswith(("بدي", "خدني")):
+            conv.one_shot = one_shot_message(rng, conv.destination, conv.pickup)
+        convs.append(conv)
+    return convs
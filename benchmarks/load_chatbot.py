@@ -0,0 +1,436 @@
+# ================================
+# 🚦 Benchmark حمل وزمن استجابة لـ /chatbot
+# ================================
+# بيشغل سيرفرات وهمية لكل الخدمات الخارجية، وبيشغل التطبيق بنفس العملية،
+# وبيعيد تشغيل محادثات حجز عربية بتزامن قابل للضبط.
+#
+# مثال:
+#   python -m benchmarks.load_chatbot --conversations 500 --concurrency 50 \
+#       --latency google=80:30 --latency openai=250:100 --latency car_api=600:400 \
+#       --errors car_api=0.05 --json bench_output.json
+#
+# --transport ws بيعيد نفس المحادثات على /ws/chatbot (اتصال واحد لكل محادثة)
+# مشان نقارن الاتصالات والأدوار بالثانية مع الـ HTTP، ومنطبع الأحداث يلي
+# وصلت push (نتائج البحث ونتيجة الرحلة).
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+import aiohttp
+
+from benchmarks.conversations import Conversation, generate_conversations
+from benchmarks.stubs import StubConfig, StubServers, parse_error_spec, parse_latency_spec
+
+MAX_TURNS_PER_CONVERSATION = 25
+
+
+# ---------------- أدوات قياس ----------------
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * p / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def deep_sizeof(obj, seen=None) -> int:
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(v, seen) for v in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, s), seen) for s in obj.__slots__ if hasattr(obj, s))
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.turns = 0
+        self.completed = 0
+        self.abandoned = 0
+        self.stuck = 0
+        self.errors = 0
+        self.turns_per_booking: List[int] = []
+        self.memory_samples: List[dict] = []
+        self.conversations = 0
+        # ws بس: الأحداث حسب النوع، وزمن وصول نتيجة الرحلة بعد جواب التأكيد
+        self.pushes: Counter = Counter()
+        self.trip_push_latencies: List[float] = []
+
+    def record(self, step: str, seconds: float):
+        self.latencies[step].append(seconds)
+        self.turns += 1
+
+
+# ---------------- تشغيل التطبيق ----------------
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_app(app, port: int):
+    import uvicorn
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+    server = uvicorn.Server(config)
+    server.install_signal_handlers = lambda: None
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def current_step(app_module, session_id: str):
+    sess = app_module.sessions.get(session_id)
+    if sess is None:
+        return None
+    return sess.step
+
+
+# ---------------- إعادة تشغيل المحادثات ----------------
+async def post_turn(http: aiohttp.ClientSession, url: str, payload: dict, stats: Stats, step: str):
+    t0 = time.perf_counter()
+    async with http.post(url, json=payload) as resp:
+        data = await resp.json()
+    stats.record(step, time.perf_counter() - t0)
+    return data
+
+
+async def ws_turn(ws: aiohttp.ClientWebSocketResponse, payload: dict, stats: Stats, step: str):
+    # sessionId ما إلو لزوم، الجلسة مربوطة بالاتصال
+    t0 = time.perf_counter()
+    await ws.send_str(json.dumps({k: v for k, v in payload.items() if k != "sessionId"}, ensure_ascii=False))
+    while True:
+        event = await ws_event(ws)
+        stats.pushes[event["type"]] += 1
+        if event["type"] == "reply":
+            break
+        if event["type"] == "error":
+            raise RuntimeError(event.get("message"))
+    stats.record(step, time.perf_counter() - t0)
+    return event
+
+
+async def ws_event(ws: aiohttp.ClientWebSocketResponse, timeout: float = None) -> dict:
+    msg = await ws.receive(timeout=timeout)
+    if msg.type != aiohttp.WSMsgType.TEXT:
+        raise ConnectionError(f"websocket closed: {msg.type}")
+    return json.loads(msg.data)
+
+
+async def wait_trip_push(ws: aiohttp.ClientWebSocketResponse, stats: Stats, timeout: float):
+    t0 = time.perf_counter()
+    deadline = t0 + timeout
+    while time.perf_counter() < deadline:
+        try:
+            event = await ws_event(ws, timeout=deadline - time.perf_counter())
+        except (asyncio.TimeoutError, ConnectionError):
+            return
+        stats.pushes[event["type"]] += 1
+        if event["type"] == "trip":
+            stats.trip_push_latencies.append(time.perf_counter() - t0)
+            return
+
+
+async def run_ws_conversation(http, ws_url, app_module, conv: Conversation, stats: Stats, push_wait: float):
+    try:
+        async with http.ws_connect(ws_url) as ws:
+            def send(payload, step):
+                return ws_turn(ws, payload, stats, step)
+            data = await run_conversation(send, app_module, conv, stats)
+            if data and data.get("tripId") and push_wait > 0:
+                await wait_trip_push(ws, stats, push_wait)
+    except aiohttp.ClientError:
+        stats.errors += 1
+
+
+async def run_conversation(send, app_module, conv: Conversation, stats: Stats):
+    # send(payload, step) بيرجع جواب الدور، بالـ HTTP أو بالـ WebSocket
+    stats.conversations += 1
+    try:
+        data = await send({"lat": conv.lat, "lng": conv.lng}, "session_start")
+    except Exception:
+        stats.errors += 1
+        return
+    session_id = data.get("sessionId")
+    if not session_id:
+        stats.errors += 1
+        return
+    turns = 1
+    while turns < MAX_TURNS_PER_CONVERSATION:
+        step = current_step(app_module, session_id)
+        if step is None:
+            return
+        if conv.abandon_at == step:
+            stats.abandoned += 1
+            return
+        msg = conv.chatter_before.pop(step, None) or conv.message_for_step(step)
+        try:
+            data = await send({"sessionId": session_id, "userInput": msg}, step)
+        except Exception:
+            stats.errors += 1
+            return
+        turns += 1
+        if data.get("done"):
+            if step == "confirm_booking" and data.get("tripId"):
+                stats.completed += 1
+                stats.turns_per_booking.append(turns)
+            elif step != "confirm_booking":
+                stats.errors += 1
+            return data
+    stats.stuck += 1
+
+
+async def sample_memory(app_module, stats: Stats, interval: float, stop: asyncio.Event):
+    while True:
+        stats.memory_samples.append(memory_snapshot(app_module))
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+            return
+        except asyncio.TimeoutError:
+            pass
+
+
+def memory_snapshot(app_module) -> dict:
+    sessions = dict(app_module.sessions)
+    cache = {}
+    for data in app_module.city_partitions.loaded():
+        cache.update({(data.city.key, q): v for q, v in dict(data.places_cache).items()})
+    snap = {
+        "t": time.time(),
+        "sessions": len(sessions),
+        "sessions_bytes": deep_sizeof(sessions),
+        "places_cache": len(cache),
+        "places_cache_bytes": deep_sizeof(cache),
+    }
+    if tracemalloc.is_tracing():
+        snap["traced_bytes"] = tracemalloc.get_traced_memory()[0]
+    return snap
+
+
+async def replay(url: str, app_module, convs: List[Conversation], concurrency: int,
+                 sample_interval: float, transport: str = "http", push_wait: float = 0.0) -> Stats:
+    stats = Stats()
+    sem = asyncio.Semaphore(concurrency)
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_memory(app_module, stats, sample_interval, stop))
+    timeout = aiohttp.ClientTimeout(total=120)
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=concurrency), timeout=timeout) as http:
+        def post(payload, step):
+            return post_turn(http, url, payload, stats, step)
+
+        async def one(conv):
+            async with sem:
+                if transport == "ws":
+                    await run_ws_conversation(http, url, app_module, conv, stats, push_wait)
+                else:
+                    await run_conversation(post, app_module, conv, stats)
+        await asyncio.gather(*(one(c) for c in convs))
+    stop.set()
+    await sampler
+    return stats
+
+
+# ---------------- التقرير ----------------
+def build_report(stats: Stats, elapsed: float, upstream: Dict[str, int], outbox_counts: Dict[str, int],
+                 app_stats: dict, args, warmup_upstream: Dict[str, int]) -> dict:
+    steps = {}
+    for step, values in sorted(stats.latencies.items()):
+        steps[step] = {
+            "count": len(values),
+            "p50_ms": round(percentile(values, 50) * 1000, 1),
+            "p90_ms": round(percentile(values, 90) * 1000, 1),
+            "p99_ms": round(percentile(values, 99) * 1000, 1),
+            "max_ms": round(max(values) * 1000, 1),
+        }
+    bookings = max(stats.completed, 1)
+    first, last = (stats.memory_samples[0], stats.memory_samples[-1]) if stats.memory_samples else ({}, {})
+    return {
+        "config": {
+            "transport": args.transport,
+            "conversations": args.conversations,
+            "concurrency": args.concurrency,
+            "latency": args.latency,
+            "errors": args.errors,
+        },
+        "elapsed_s": round(elapsed, 2),
+        "turns": stats.turns,
+        "turns_per_sec": round(stats.turns / elapsed, 1) if elapsed else 0,
+        "conversations_per_sec": round(stats.conversations / elapsed, 1) if elapsed else 0,
+        "pushes": dict(stats.pushes),
+        "trip_push_ms": {
+            "count": len(stats.trip_push_latencies),
+            "p50": round(percentile(stats.trip_push_latencies, 50) * 1000, 1),
+            "p90": round(percentile(stats.trip_push_latencies, 90) * 1000, 1),
+        },
+        "completed_bookings": stats.completed,
+        "trip_outbox": outbox_counts,
+        "abandoned": stats.abandoned,
+        "stuck": stats.stuck,
+        "errors": stats.errors,
+        "avg_turns_per_booking": round(sum(stats.turns_per_booking) / bookings, 2),
+        "steps": steps,
+        "upstream_calls": upstream,
+        "upstream_calls_per_booking": {k: round(v / bookings, 2) for k, v in sorted(upstream.items())},
+        "warmup_upstream_calls": warmup_upstream,
+        "app_stats": app_stats,
+        "memory": {
+            "sessions_growth": last.get("sessions", 0) - first.get("sessions", 0),
+            "sessions_bytes_growth": last.get("sessions_bytes", 0) - first.get("sessions_bytes", 0),
+            "places_cache_growth": last.get("places_cache", 0) - first.get("places_cache", 0),
+            "places_cache_bytes_growth": last.get("places_cache_bytes", 0) - first.get("places_cache_bytes", 0),
+            "samples": stats.memory_samples,
+        },
+    }
+
+
+def print_report(report: dict):
+    print(f"\ntransport: {report['config']['transport']}  turns: {report['turns']}  elapsed: {report['elapsed_s']}s  "
+          f"turns/sec: {report['turns_per_sec']}  conversations/sec: {report['conversations_per_sec']}")
+    if report["pushes"]:
+        trip = report["trip_push_ms"]
+        print(f"pushed events: {report['pushes']}  trip outcome pushes: {trip['count']} "
+              f"(p50 {trip['p50']}ms, p90 {trip['p90']}ms after the confirm reply)")
+    print(f"bookings: completed={report['completed_bookings']} trip_outbox={report['trip_outbox']} "
+          f"abandoned={report['abandoned']} stuck={report['stuck']} errors={report['errors']} "
+          f"avg turns/booking={report['avg_turns_per_booking']}")
+    print(f"\n{'step':<22}{'count':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for step, s in report["steps"].items():
+        print(f"{step:<22}{s['count']:>8}{s['p50_ms']:>10}{s['p90_ms']:>10}{s['p99_ms']:>10}{s['max_ms']:>10}")
+    print("\nupstream calls per completed booking:")
+    for name, v in report["upstream_calls_per_booking"].items():
+        print(f"  {name:<32}{v:>8}")
+    print("\ncache hit rate:")
+    for name, c in report["app_stats"].get("cache_hits", {}).items():
+        total = c["hit"] + c["miss"]
+        print(f"  {name:<32}{(c['hit'] / total if total else 0):>8.2f}  ({c['hit']}/{total})")
+    if report["warmup_upstream_calls"]:
+        print(f"  warm-up upstream calls: {report['warmup_upstream_calls']}")
+    print("\nsingle-flight (executed / coalesced):")
+    for name, s in report["app_stats"].get("singleflight", {}).items():
+        print(f"  {name:<32}{s['executed']:>8}{s['coalesced']:>8}")
+    mem = report["memory"]
+    print(f"\nsessions: +{mem['sessions_growth']} ({mem['sessions_bytes_growth']} bytes)  "
+          f"places_cache: +{mem['places_cache_growth']} ({mem['places_cache_bytes_growth']} bytes)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay Arabic booking conversations against /chatbot")
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chatter-rate", type=float, default=0.15)
+    parser.add_argument("--abandon-rate", type=float, default=0.1)
+    parser.add_argument("--oneshot-rate", type=float, default=0.0,
+                        help="share of conversations that open with several slots in one message")
+    parser.add_argument("--latency", action="append", default=[], metavar="SERVICE=MEAN_MS[:STD_MS]",
+                        help="services: google, openai, pinecone, car_api")
+    parser.add_argument("--errors", action="append", default=[], metavar="SERVICE=RATE")
+    parser.add_argument("--sample-interval", type=float, default=1.0)
+    parser.add_argument("--tracemalloc", action="store_true")
+    parser.add_argument("--outbox-wait", type=float, default=30.0,
+                        help="seconds to wait for queued trips to be submitted before reporting")
+    parser.add_argument("--query-log", help="query frequency log to read/append (default: a temp file)")
+    parser.add_argument("--no-warm", action="store_true", help="skip the startup cache warm-up")
+    parser.add_argument("--warm-wait", type=float, default=120.0,
+                        help="seconds to wait for the startup warm-up before replaying")
+    parser.add_argument("--transport", choices=["http", "ws"], default="http",
+                        help="POST /chatbot per turn, or one /ws/chatbot connection per conversation")
+    parser.add_argument("--push-wait", type=float, default=10.0,
+                        help="ws: seconds to keep the connection open for the trip outcome push")
+    parser.add_argument("--json", dest="json_path")
+    return parser.parse_args(argv)
+
+
+def wait_for_outbox(app_module, timeout: float) -> Dict[str, int]:
+    # ننطر الـ outbox يخلص الطلبات المعلقة حتى نعرف كم حجز تأكد فعلياً
+    deadline = time.time() + timeout
+    while True:
+        counts = app_module.trip_outbox.counts()
+        pending = counts.get("pending", 0) + counts.get("sending", 0)
+        if not pending or time.time() > deadline:
+            return counts
+        time.sleep(0.2)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = StubConfig(seed=args.seed)
+    parse_latency_spec(args.latency, config)
+    parse_error_spec(args.errors, config)
+
+    stubs = StubServers(config).start()
+    os.environ.update(stubs.env())
+    outbox_dir = tempfile.mkdtemp(prefix="bench-outbox-")
+    os.environ["TRIP_OUTBOX_PATH"] = os.path.join(outbox_dir, "trip_outbox.db")
+    # الـ benchmark ما بيكتب سجل الاستعلامات جنب الكود إلا إذا طلبناه
+    os.environ["QUERY_LOG_PATH"] = args.query_log or os.path.join(outbox_dir, "query_log.tsv")
+    os.environ["CACHE_WARM_ON_STARTUP"] = "0" if args.no_warm else "1"
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    # لازم نستورد التطبيق بعد ضبط متغيرات البيئة
+    import main as app_module
+
+    port = free_port()
+    server, thread = start_app(app_module.app, port)
+    # الطلبات يلي صارت عند الإقلاع (embeddings للأماكن المحلية) ما منحسبها
+    stubs.reset_counts()
+    warmup_upstream = {}
+    if not args.no_warm:
+        # بعد الـ deploy: ننطر التسخين يخلص ومنحسب طلباته لحال
+        deadline = time.time() + args.warm_wait
+        while app_module.cache_warmer.stats()["runs"] < 1 and time.time() < deadline:
+            time.sleep(0.2)
+        warmup_upstream = dict(stubs.snapshot_counts())
+        stubs.reset_counts()
+        app_module.cache_hits.clear()
+
+    convs = generate_conversations(args.conversations, seed=args.seed,
+                                   chatter_rate=args.chatter_rate, abandon_rate=args.abandon_rate,
+                                   oneshot_rate=args.oneshot_rate)
+    if args.transport == "ws":
+        url = f"ws://127.0.0.1:{port}/ws/chatbot"
+    else:
+        url = f"http://127.0.0.1:{port}/chatbot"
+    t0 = time.perf_counter()
+    stats = asyncio.run(replay(url, app_module, convs, args.concurrency, args.sample_interval,
+                               args.transport, args.push_wait))
+    elapsed = time.perf_counter() - t0
+    outbox_counts = wait_for_outbox(app_module, args.outbox_wait)
+
+    if app_module.query_log:
+        app_module.query_log.flush()
+    report = build_report(stats, elapsed, Counter(stubs.snapshot_counts()), outbox_counts, app_module.stats(), args,
+                          warmup_upstream)
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    server.should_exit = True
+    thread.join(timeout=10)
+    stubs.stop()
+
+
+if __name__ == "__main__":
+    main()
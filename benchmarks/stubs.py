@@ -0,0 +1,385 @@
+# ================================
+# 🧪 سيرفرات وهمية للخدمات الخارجية (Google / OpenAI / Pinecone / API الحجز)
+# ================================
+# كل خدمة إلها سيرفر aiohttp مستقل وتوزيع تأخير ونسبة أخطاء قابلين للضبط،
+# ومنعد كل طلب وصلها حتى نحسب عدد الطلبات الخارجية لكل حجز.
+import asyncio
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+from cities import CityLocator, load_cities
+
+EMBEDDING_DIM = 1536
+DAMASCUS_CENTER = (33.5138, 36.2765)
+
+SERVICES = ["google", "openai", "pinecone", "car_api"]
+
+# اسم المدينة بالعناوين الوهمية حسب الموقع (نفس data/cities.json يلي بيستعملها التطبيق)
+STUB_CITIES = CityLocator(load_cities(), "damascus")
+
+# أماكن الـ Pinecone الوهمي (نفس أسماء seed_places.py)
+STUB_PLACES = [
+    "باب توما", "البرامكة", "المزة القديمة", "أبو رمانة", "المالكي", "القصاع",
+    "باب شرقي", "الحميدية", "سوق الحميدية", "ركن الدين", "المهاجرين", "الشعلان",
+    "ساحة الأمويين", "كفرسوسة البلد", "مشروع دمر", "برزة البلد", "القابون",
+    "الميدان", "الشاغور", "جرمانا", "مزة 86", "الجلاء", "شارع بغداد", "شارع الثورة",
+]
+
+STUB_CAR_TYPES = [
+    {
+        "Id": 1, "Ar_Name": "عادية", "En_Name": "Standard", "Min_Price": 15000,
+        "A_Price_Catg": [
+            {"From_Dis": 0, "To_Dis": 10, "Price": 4000},
+            {"From_Dis": 10, "To_Dis": 1000, "Price": 3500},
+        ],
+    },
+    {
+        "Id": 2, "Ar_Name": "VIP", "En_Name": "VIP", "Min_Price": 30000,
+        "A_Price_Catg": [
+            {"From_Dis": 0, "To_Dis": 10, "Price": 8000},
+            {"From_Dis": 10, "To_Dis": 1000, "Price": 7000},
+        ],
+    },
+    {
+        "Id": 3, "Ar_Name": "عائلية", "En_Name": "Family", "Min_Price": 25000,
+        "A_Price_Catg": [
+            {"From_Dis": 0, "To_Dis": 1000, "Price": 6000},
+        ],
+    },
+]
+
+
+@dataclass
+class LatencyModel:
+    # التأخير بالميلي ثانية: توزيع lognormal بمتوسط mean_ms وانحراف std_ms
+    mean_ms: float = 0.0
+    std_ms: float = 0.0
+    error_rate: float = 0.0
+
+    def sample_delay(self, rng: random.Random) -> float:
+        if self.mean_ms <= 0:
+            return 0.0
+        if self.std_ms <= 0:
+            return self.mean_ms / 1000
+        sigma2 = math.log(1 + (self.std_ms / self.mean_ms) ** 2)
+        mu = math.log(self.mean_ms) - sigma2 / 2
+        return rng.lognormvariate(mu, math.sqrt(sigma2)) / 1000
+
+    def should_fail(self, rng: random.Random) -> bool:
+        return self.error_rate > 0 and rng.random() < self.error_rate
+
+
+@dataclass
+class StubConfig:
+    latency: Dict[str, LatencyModel] = field(default_factory=lambda: {s: LatencyModel() for s in SERVICES})
+    # حد التشابه يلي فوقه الـ Pinecone الوهمي برجع نتيجة
+    pinecone_min_score: float = 0.55
+    seed: int = 1234
+
+
+def stub_embedding(text: str) -> List[float]:
+    # embedding حتمي من char trigrams حتى الأسماء المتشابهة تعطي تشابه عالي
+    vec = [0.0] * EMBEDDING_DIM
+    padded = f"  {text.strip()}  "
+    for i in range(len(padded) - 2):
+        h = zlib.crc32(padded[i:i + 3].encode("utf-8"))
+        vec[h % EMBEDDING_DIM] += 1.0 if (h >> 16) & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+    return [v / norm for v in vec]
+
+
+def _dot(a: List[float], b: List[float]) -> float:
+    return sum(x * y for x, y in zip(a, b) if x and y)
+
+
+def _fake_coords(key: str):
+    # إحداثيات حتمية ضمن ~8 كم من مركز دمشق
+    h = hashlib.sha1(key.encode("utf-8")).digest()
+    dlat = (int.from_bytes(h[:4], "big") / 2 ** 32 - 0.5) * 0.14
+    dlng = (int.from_bytes(h[4:8], "big") / 2 ** 32 - 0.5) * 0.16
+    return round(DAMASCUS_CENTER[0] + dlat, 6), round(DAMASCUS_CENTER[1] + dlng, 6)
+
+
+def _parse_point(text: str):
+    parts = text.split(",")
+    if len(parts) == 2:
+        try:
+            return float(parts[0]), float(parts[1])
+        except ValueError:
+            pass
+    return _fake_coords(text)
+
+
+def _haversine(lat1, lng1, lat2, lng2):
+    r = 6371
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = math.radians(lat2 - lat1), math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * r * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+class StubServers:
+    def __init__(self, config: Optional[StubConfig] = None, host: str = "127.0.0.1"):
+        self.config = config or StubConfig()
+        self.host = host
+        self.calls: Counter = Counter()
+        self.ports: Dict[str, int] = {}
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._runners: List[web.AppRunner] = []
+        self._place_vectors = {name: stub_embedding(name) for name in STUB_PLACES}
+
+    # ---------------- تشغيل وإيقاف ----------------
+    def start(self):
+        started = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(started,), daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self):
+        if self._loop is None:
+            return
+        fut = asyncio.run_coroutine_threadsafe(self._cleanup(), self._loop)
+        fut.result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=10)
+
+    def _run(self, started: threading.Event):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._setup())
+        started.set()
+        self._loop.run_forever()
+
+    async def _setup(self):
+        apps = {
+            "google": self._google_app(),
+            "openai": self._openai_app(),
+            "pinecone": self._pinecone_app(),
+            "car_api": self._car_api_app(),
+        }
+        for service, app in apps.items():
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            site = web.TCPSite(runner, self.host, 0)
+            await site.start()
+            self.ports[service] = site._server.sockets[0].getsockname()[1]
+            self._runners.append(runner)
+
+    async def _cleanup(self):
+        for runner in self._runners:
+            await runner.cleanup()
+
+    def url(self, service: str) -> str:
+        return f"http://{self.host}:{self.ports[service]}"
+
+    def env(self) -> Dict[str, str]:
+        # متغيرات البيئة يلي بتوجه main.py للسيرفرات الوهمية
+        return {
+            "GOOGLE_MAPS_BASE_URL": self.url("google"),
+            "GOOGLE_MAPS_API_KEY": "stub",
+            "OPENAI_BASE_URL": f"{self.url('openai')}/v1",
+            "OPENAI_API_KEY": "stub",
+            "PINECONE_API_KEY": "stub",
+            "PINECONE_INDEX_HOST": self.url("pinecone"),
+            "CAR_API_BASE_URL": self.url("car_api"),
+        }
+
+    def reset_counts(self):
+        with self._lock:
+            self.calls.clear()
+
+    def snapshot_counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.calls)
+
+    # ---------------- تأخير وأخطاء ----------------
+    async def _simulate(self, service: str, endpoint: str) -> bool:
+        model = self.config.latency.get(service, LatencyModel())
+        with self._lock:
+            self.calls[f"{service}.{endpoint}"] += 1
+            delay = model.sample_delay(self._rng)
+            fail = model.should_fail(self._rng)
+        if delay:
+            await asyncio.sleep(delay)
+        if fail:
+            with self._lock:
+                self.calls[f"{service}.{endpoint}.error"] += 1
+        return fail
+
+    # ---------------- Google ----------------
+    def _google_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/maps/api/geocode/json", self._google_geocode)
+        app.router.add_get("/maps/api/place/autocomplete/json", self._google_autocomplete)
+        app.router.add_get("/maps/api/place/details/json", self._google_details)
+        app.router.add_get("/maps/api/directions/json", self._google_directions)
+        return app
+
+    async def _google_geocode(self, request: web.Request):
+        endpoint = "reverse_geocode" if "latlng" in request.query else "geocode"
+        if await self._simulate("google", endpoint):
+            return web.json_response({"status": "UNKNOWN_ERROR", "results": []})
+        if endpoint == "reverse_geocode":
+            lat, lng = _parse_point(request.query["latlng"])
+            street = STUB_PLACES[int(abs(lat * 1000 + lng * 1000)) % len(STUB_PLACES)]
+            city = STUB_CITIES.locate(lat, lng).name
+            return web.json_response({"status": "OK", "results": [{
+                "formatted_address": f"شارع {street}، {city}، سوريا",
+                "geometry": {"location": {"lat": lat, "lng": lng}},
+            }]})
+        address = request.query.get("address", "")
+        lat, lng = _fake_coords(address)
+        return web.json_response({"status": "OK", "results": [{
+            "formatted_address": address,
+            "geometry": {"location": {"lat": lat, "lng": lng}},
+        }]})
+
+    async def _google_autocomplete(self, request: web.Request):
+        if await self._simulate("google", "autocomplete"):
+            return web.json_response({"status": "UNKNOWN_ERROR", "predictions": []})
+        query = request.query.get("input", "").strip()
+        if not query:
+            return web.json_response({"status": "ZERO_RESULTS", "predictions": []})
+        count = 1 + zlib.crc32(query.encode("utf-8")) % 3
+        city = STUB_CITIES.locate(*_parse_point(request.query.get("location", ""))).name
+        predictions = []
+        for i in range(count):
+            suffix = "" if i == 0 else f" {i + 1}"
+            predictions.append({
+                "description": f"{query}{suffix}، {city}، سوريا",
+                "place_id": "stub_" + hashlib.md5(f"{query}{suffix}".encode("utf-8")).hexdigest()[:16],
+            })
+        return web.json_response({"status": "OK", "predictions": predictions})
+
+    async def _google_details(self, request: web.Request):
+        if await self._simulate("google", "details"):
+            return web.json_response({"status": "UNKNOWN_ERROR"})
+        place_id = request.query.get("place_id", "")
+        lat, lng = _fake_coords(place_id)
+        return web.json_response({"status": "OK", "result": {
+            "formatted_address": f"مكان {place_id[-4:]}، دمشق، سوريا",
+            "geometry": {"location": {"lat": lat, "lng": lng}},
+        }})
+
+    async def _google_directions(self, request: web.Request):
+        if await self._simulate("google", "directions"):
+            return web.json_response({"status": "UNKNOWN_ERROR", "routes": []})
+        o = _parse_point(request.query.get("origin", ""))
+        d = _parse_point(request.query.get("destination", ""))
+        meters = int(_haversine(o[0], o[1], d[0], d[1]) * 1.3 * 1000) + 300
+        return web.json_response({"status": "OK", "routes": [{"legs": [{
+            "distance": {"value": meters, "text": f"{meters / 1000:.1f} كم"},
+            "duration": {"value": int(meters / 8.3), "text": ""},
+        }]}]})
+
+    # ---------------- OpenAI ----------------
+    def _openai_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/v1/embeddings", self._openai_embeddings)
+        app.router.add_post("/v1/chat/completions", self._openai_chat)
+        return app
+
+    async def _openai_embeddings(self, request: web.Request):
+        body = await request.json()
+        if await self._simulate("openai", "embeddings"):
+            return web.json_response({"error": {"message": "stub failure", "type": "server_error"}}, status=500)
+        inputs = body.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        data = [{"object": "embedding", "index": i, "embedding": stub_embedding(t)} for i, t in enumerate(inputs)]
+        return web.json_response({
+            "object": "list", "data": data, "model": body.get("model", ""),
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        })
+
+    async def _openai_chat(self, request: web.Request):
+        body = await request.json()
+        if await self._simulate("openai", "chat"):
+            return web.json_response({"error": {"message": "stub failure", "type": "server_error"}}, status=500)
+        return web.json_response({
+            "id": "chatcmpl-stub", "object": "chat.completion", "created": int(time.time()),
+            "model": body.get("model", ""),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": "أهلين! أنا بخدمتك 😊"}}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        })
+
+    # ---------------- Pinecone (data plane) ----------------
+    def _pinecone_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/query", self._pinecone_query)
+        app.router.add_post("/vectors/upsert", self._pinecone_upsert)
+        return app
+
+    async def _pinecone_query(self, request: web.Request):
+        body = await request.json()
+        if await self._simulate("pinecone", "query"):
+            return web.json_response({"code": 13, "message": "stub failure"}, status=500)
+        vector = body.get("vector") or []
+        top_k = int(body.get("topK", 3))
+        namespace = body.get("namespace", "")
+        if namespace:
+            # الأماكن الوهمية كلها بدمشق (الـ namespace الافتراضي)، والمدن التانية فاضية
+            return web.json_response({"matches": [], "namespace": namespace})
+        scored = sorted(((_dot(vector, v), name) for name, v in self._place_vectors.items()), reverse=True)
+        matches = [
+            {"id": f"place-{name}", "score": score,
+             "metadata": {"name": name, "address": f"{name}، دمشق، سوريا"}}
+            for score, name in scored[:top_k] if score >= self.config.pinecone_min_score
+        ]
+        return web.json_response({"matches": matches, "namespace": ""})
+
+    async def _pinecone_upsert(self, request: web.Request):
+        body = await request.json()
+        await self._simulate("pinecone", "upsert")
+        return web.json_response({"upsertedCount": len(body.get("vectors", []))})
+
+    # ---------------- API الحجز ----------------
+    def _car_api_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/codeTables/priceCategories/all", self._car_types)
+        app.router.add_post("/api/travel/request/create", self._trip_create)
+        return app
+
+    async def _car_types(self, request: web.Request):
+        if await self._simulate("car_api", "car_types"):
+            return web.json_response({"success": False, "message": "stub failure"}, status=500)
+        return web.json_response({"success": True, "data": STUB_CAR_TYPES})
+
+    async def _trip_create(self, request: web.Request):
+        body = await request.json()
+        if await self._simulate("car_api", "trip_create"):
+            return web.json_response({"success": False, "message": "الخدمة غير متاحة حالياً"}, status=503)
+        trip = body if isinstance(body, dict) else {}
+        return web.json_response({"success": True, "data": {"Id": zlib.crc32(json.dumps(trip, sort_keys=True).encode()), **trip}})
+
+
+def parse_latency_spec(specs: List[str], config: StubConfig):
+    # صيغة: service=MEAN_MS[:STD_MS]  مثال: google=80:30
+    for spec in specs or []:
+        service, _, value = spec.partition("=")
+        mean, _, std = value.partition(":")
+        model = config.latency.setdefault(service, LatencyModel())
+        model.mean_ms = float(mean)
+        model.std_ms = float(std or 0)
+
+
+def parse_error_spec(specs: List[str], config: StubConfig):
+    # صيغة: service=RATE  مثال: car_api=0.05
+    for spec in specs or []:
+        service, _, value = spec.partition("=")
+        config.latency.setdefault(service, LatencyModel()).error_rate = float(value)
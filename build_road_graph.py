@@ -0,0 +1,29 @@
+# ================================
+# 🛣️ بناء شبكة الطرق من OSM
+# ================================
+# بياخد ملف OSM XML لدمشق (مثلاً من extract أو Overpass) وبيطلع ملف .npz
+# جاهز لـ ROAD_GRAPH_PATH.
+#
+# مثال:
+#   python build_road_graph.py damascus.osm damascus_roads.npz
+import argparse
+import time
+
+from road_routing import build_from_osm
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a CSR road graph (.npz) from an OSM XML extract")
+    parser.add_argument("osm_path")
+    parser.add_argument("out_path")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    graph = build_from_osm(args.osm_path)
+    graph.save(args.out_path)
+    print(f"✅ {graph.node_count} nodes, {graph.edge_count} edges, "
+          f"{graph.memory_bytes() / 1e6:.1f} MB in {time.perf_counter() - started:.1f}s → {args.out_path}")
+
+
+if __name__ == "__main__":
+    main()
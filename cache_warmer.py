@@ -0,0 +1,108 @@
+# ================================
+# 🔥 تسخين الكاشات بعد الـ deploy
+# ================================
+# build_tasks بيرجع قائمة (النوع، الدالة، الوسائط) مرتبة حسب الأهمية، والـ warmer
+# بينفذها بالتوازي (concurrency) بس بمعدل محدود (rate بالثانية) مشان ما ياكل
+# حصة Google من الطلبات الحقيقية. بيشتغل مرة عند الإقلاع، وإذا interval > 0
+# بيعيد كل interval ثانية.
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+WarmTask = Tuple[str, Callable, tuple]
+
+
+class CacheWarmer:
+    def __init__(self, build_tasks: Callable[[], List[WarmTask]], rate: float = 10.0,
+                 concurrency: int = 4, interval: float = 0.0):
+        # rate بيقسم فترة التوزيع، فـ 0 أو سالب غلط بالإعدادات (CACHE_WARM_RATE) مو "بلا حد"
+        if rate <= 0:
+            raise ValueError(f"معدل تسخين الكاش لازم يكون أكبر من 0: {rate}")
+        if concurrency < 1:
+            raise ValueError(f"عدد threads تسخين الكاش لازم يكون 1 أو أكتر: {concurrency}")
+        self.build_tasks = build_tasks
+        self.rate = rate
+        self.concurrency = concurrency
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.running = False
+        self.last_run: Dict[str, object] = {}
+
+    def run_once(self) -> Dict[str, object]:
+        with self._lock:
+            self.running = True
+        try:
+            return self._run_tasks()
+        finally:
+            with self._lock:
+                self.running = False
+
+    def _run_tasks(self) -> Dict[str, object]:
+        started = time.monotonic()
+        done: Dict[str, int] = {}
+        failed: Dict[str, int] = {}
+        tasks = self.build_tasks()
+
+        def run(kind, fn, args):
+            try:
+                fn(*args)
+                bucket = done
+            except Exception:
+                bucket = failed
+            with self._lock:
+                bucket[kind] = bucket.get(kind, 0) + 1
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="cache-warmer") as pool:
+            futures = []
+            next_at = time.monotonic()
+            for kind, fn, args in tasks:
+                if self._stop.is_set():
+                    break
+                # توزيع الطلبات بالتساوي على rate بالثانية
+                delay = next_at - time.monotonic()
+                if delay > 0 and self._stop.wait(delay):
+                    break
+                next_at = max(next_at, time.monotonic()) + 1.0 / self.rate
+                futures.append(pool.submit(run, kind, fn, args))
+            wait(futures)
+
+        result = {
+            "tasks": len(tasks),
+            "done": done,
+            "failed": failed,
+            "seconds": round(time.monotonic() - started, 2),
+            "finished_at": time.time(),
+        }
+        with self._lock:
+            self.runs += 1
+            self.last_run = result
+        return result
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print("خطأ بتسخين الكاش:", e)
+            if self.interval <= 0 or self._stop.wait(self.interval):
+                return
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="cache-warmer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {"runs": self.runs, "running": self.running, "last_run": dict(self.last_run)}
@@ -0,0 +1,198 @@
+# ================================
+# 🏙️ المدن: تحديد المدينة من الموقع، وبيانات كل مدينة لحال
+# ================================
+# data/cities.json فيه لكل مدينة: المفتاح (اسم ملف الـ gazetteer)، الاسم متل ما
+# بيطلع بعناوين Google، المركز، الـ bounding box (جنوب، غرب، شمال، شرق)، و
+# namespace بـ Pinecone، وكلمات اسم المدينة يلي ما بتميز بين أماكنها (stop_words
+# لفهرس الـ n-grams). CityLocator بيختار المدينة من lat/lng بمقارنة مع الـ
+# boxes (الأصغر أولاً، وإذا ولا وحدة فالمدينة الافتراضية): كم مقارنة، بدون شبكة.
+#
+# CityPartitions: بيانات كل مدينة (الأماكن، الفهارس، الكاشات) بتتحمل أول ما
+# تنطلب بس، وإذا ما حدا طلبها idle_seconds بتنشال من الذاكرة (إلا المدن الـ pinned)،
+# فكل worker بيحمل المدن يلي عم يخدمها فعلاً بس.
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from singleflight import SingleFlight
+
+CITIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cities.json")
+
+
+class City:
+    __slots__ = ("key", "name", "center", "bbox", "pinecone_namespace", "stop_words")
+
+    def __init__(self, key: str, name: str, center: Tuple[float, float],
+                 bbox: Tuple[float, float, float, float], pinecone_namespace: str = "",
+                 stop_words: Sequence[str] = ()):
+        self.key = key
+        self.name = name
+        self.center = tuple(center)
+        self.bbox = tuple(bbox)
+        self.pinecone_namespace = pinecone_namespace
+        self.stop_words = tuple(stop_words)
+
+    def contains(self, lat: float, lng: float) -> bool:
+        south, west, north, east = self.bbox
+        return south <= lat <= north and west <= lng <= east
+
+    def area(self) -> float:
+        south, west, north, east = self.bbox
+        return (north - south) * (east - west)
+
+
+def load_cities(path: str = CITIES_PATH) -> List[City]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return [
+        City(c["key"], c["name"], c["center"], c["bbox"], c.get("pinecone_namespace", c["key"]),
+             c.get("stop_words", [c["name"]]))
+        for c in data
+    ]
+
+
+class CityLocator:
+    def __init__(self, cities: List[City], default_key: str):
+        self.cities = list(cities)
+        self.by_key = {c.key: c for c in cities}
+        if default_key not in self.by_key:
+            raise ValueError(f"المدينة الافتراضية مو موجودة: {default_key}")
+        self.default = self.by_key[default_key]
+        # الأصغر أولاً: مدينة صغيرة جوا box مدينة أكبر بتنلقى هي
+        self._by_area = sorted(cities, key=lambda c: c.area())
+
+    def locate(self, lat: Optional[float], lng: Optional[float]) -> City:
+        if lat is None or lng is None:
+            return self.default
+        for city in self._by_area:
+            if city.contains(lat, lng):
+                return city
+        return self.default
+
+    def get(self, key: Optional[str]) -> City:
+        return self.by_key.get(key or "", self.default)
+
+    def names(self) -> List[str]:
+        return [c.name for c in self.cities]
+
+
+class CityData:
+    # كل شي خاص بمدينة وحدة: بينشال كله سوا لما المدينة تخمل
+    __slots__ = ("city", "gazetteer", "ngram_index", "matcher",
+                 "places_cache", "geocode_cache", "details_cache", "reverse_geocode_cache")
+
+    def __init__(self, city: City, gazetteer: Dict[str, str], ngram_index, matcher):
+        self.city = city
+        self.gazetteer = gazetteer
+        self.ngram_index = ngram_index
+        self.matcher = matcher
+        self.places_cache: Dict[str, list] = {}
+        self.geocode_cache: Dict[str, Dict[str, float]] = {}
+        self.details_cache: Dict[str, dict] = {}
+        self.reverse_geocode_cache: Dict[str, str] = {}
+
+    def close(self):
+        self.matcher.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "places": len(self.gazetteer),
+            "places_cache": len(self.places_cache),
+            "geocode_cache": len(self.geocode_cache),
+            "details_cache": len(self.details_cache),
+            "reverse_geocode_cache": len(self.reverse_geocode_cache),
+            "matcher": self.matcher.stats(),
+        }
+
+
+class CityPartitions:
+    def __init__(self, loader: Callable[[City], CityData], idle_seconds: float = 1800.0,
+                 pinned: Iterable[str] = ()):
+        self.loader = loader
+        self.idle_seconds = idle_seconds
+        self.pinned = set(pinned)
+        self._lock = threading.Lock()
+        self._loaded: Dict[str, CityData] = {}
+        self._last_used: Dict[str, float] = {}
+        # طلبات متزامنة لمدينة مو محملة بتستنى تحميل واحد
+        self._flight = SingleFlight("city_partitions")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, city: City) -> CityData:
+        with self._lock:
+            data = self._loaded.get(city.key)
+            if data is not None:
+                self._last_used[city.key] = time.monotonic()
+                return data
+        return self._flight.do(city.key, self._load, city)
+
+    def _load(self, city: City) -> CityData:
+        with self._lock:
+            data = self._loaded.get(city.key)
+            if data is not None:
+                return data
+        data = self.loader(city)
+        with self._lock:
+            self._loaded[city.key] = data
+            self._last_used[city.key] = time.monotonic()
+            self.loads += 1
+        return data
+
+    def loaded(self) -> List[CityData]:
+        with self._lock:
+            return list(self._loaded.values())
+
+    def evict_idle(self, now: Optional[float] = None) -> List[str]:
+        now = time.monotonic() if now is None else now
+        evicted = []
+        with self._lock:
+            for key, used in list(self._last_used.items()):
+                if key not in self.pinned and now - used >= self.idle_seconds:
+                    evicted.append(self._loaded.pop(key))
+                    del self._last_used[key]
+                    self.evictions += 1
+        # الطلبات يلي لسا ماسكة البيانات بتكمل عادي، وأول طلب جديد بيرجع يحملها
+        for data in evicted:
+            data.close()
+        return [data.city.key for data in evicted]
+
+    def _run(self):
+        while not self._stop.wait(max(1.0, self.idle_seconds / 4)):
+            try:
+                self.evict_idle()
+            except Exception as e:
+                print("خطأ بتفريغ بيانات المدن:", e)
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="city-partitions", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        with self._lock:
+            loaded, self._loaded, self._last_used = list(self._loaded.values()), {}, {}
+        for data in loaded:
+            data.close()
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            loaded = dict(self._loaded)
+            idle = {key: round(now - used, 1) for key, used in self._last_used.items()}
+        return {
+            "idle_seconds": self.idle_seconds,
+            "pinned": sorted(self.pinned),
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "loaded": {key: {"idle_s": idle.get(key, 0.0), **data.stats()} for key, data in loaded.items()},
+        }
@@ -0,0 +1,110 @@
+# ================================
+# 🗜️ تخزين embeddings الأماكن مضغوط (float16 / int8)
+# ================================
+# الـ embeddings كانت lists من floats (كل رقم object لحاله)، هون صارت مصفوفة
+# وحدة متلاصقة بالذاكرة بأحد الأنواع:
+#   float32: متل قبل (المرجع)
+#   float16: نص الحجم، والخطأ بالتشابه تقريباً صفر، بس تحويل numpy من float16
+#            بطيء (مو SIMD) فالبحث أبطأ بكتير، منيح إذا الذاكرة أهم من السرعة
+#   int8:    ربع الحجم، كل صف إلو scale (أكبر قيمة مطلقة / 127)، وبنفس سرعة float32
+# و dims > 0 بتقص أول dims بعد من كل vector وبترجع تعمل normalize. موديلات
+# text-embedding-3 متدربة إنو أول الأبعاد تحمل أغلب المعنى (متل باراميتر
+# dimensions بالـ API)، فالاستعلام كمان بينقص بنفس الطريقة قبل المقارنة.
+# التشابه بينحسب على المصفوفة المضغوطة نفسها، كتلة كتلة (SCORE_BLOCK_ROWS صف)
+# بتتحول لـ float32 بـ buffer صغير بيساع بالـ cache، مشان ما ننسخ المصفوفة كلها
+# مع كل استعلام (الأرقام بـ benchmarks/bench_embedding_store.py).
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+STORE_DTYPES = ("float32", "float16", "int8")
+SCORE_BLOCK_ROWS = 128
+
+
+def normalize_rows(matrix) -> np.ndarray:
+    m = np.asarray(matrix, dtype=np.float32)
+    if m.ndim != 2:
+        m = m.reshape(len(m), -1)
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return m / norms
+
+
+class EmbeddingStore:
+    def __init__(self, data: np.ndarray, scales: Optional[np.ndarray] = None):
+        self.data = data
+        self.scales = scales
+        self.dtype = data.dtype.name
+        self.dims = data.shape[1] if data.ndim == 2 else 0
+
+    @classmethod
+    def build(cls, matrix, dtype: str = "float32", dims: int = 0) -> "EmbeddingStore":
+        if dtype not in STORE_DTYPES:
+            raise ValueError(f"نوع تخزين غير معروف: {dtype} (المتاح: {', '.join(STORE_DTYPES)})")
+        m = np.asarray(matrix, dtype=np.float32)
+        if m.ndim != 2:
+            m = m.reshape(len(m), -1)
+        if dims and dims < m.shape[1]:
+            m = m[:, :dims]
+        m = normalize_rows(m)
+        if dtype == "int8":
+            scales = np.abs(m).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            data = np.round(m / scales[:, None]).astype(np.int8)
+            return cls(data, scales.astype(np.float32))
+        return cls(m.astype(np.float16) if dtype == "float16" else m)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        # المصفوفات يلي لازم تنتقل للـ workers (shared memory)
+        arrays = {"data": self.data}
+        if self.scales is not None:
+            arrays["scales"] = self.scales
+        return arrays
+
+    def prepare_query(self, query_vec) -> Optional[np.ndarray]:
+        q = np.asarray(query_vec, dtype=np.float32).ravel()[:self.dims]
+        norm = float(np.linalg.norm(q))
+        if norm == 0:
+            return None
+        return q / norm
+
+    def scores(self, q: np.ndarray) -> np.ndarray:
+        # q لازم يكون طالع من prepare_query
+        if self.dtype == "float32":
+            out = self.data @ q
+        else:
+            out = np.empty(len(self.data), dtype=np.float32)
+            buf = np.empty((min(SCORE_BLOCK_ROWS, len(self.data)), self.dims), dtype=np.float32)
+            for start in range(0, len(self.data), SCORE_BLOCK_ROWS):
+                block = self.data[start:start + SCORE_BLOCK_ROWS]
+                rows = buf[:len(block)]
+                np.copyto(rows, block, casting="unsafe")
+                np.matmul(rows, q, out=out[start:start + len(block)])
+        if self.scales is not None:
+            out *= self.scales
+        return out
+
+    def best(self, query_vec) -> Tuple[int, float]:
+        # (رقم الصف، التشابه) أو (-1، 0) إذا الاستعلام فاضي
+        q = self.prepare_query(query_vec)
+        if q is None or not len(self.data):
+            return -1, 0.0
+        scores = self.scores(q)
+        idx = int(np.argmax(scores))
+        return idx, float(scores[idx])
+
+    def top_k(self, query_vec, k: int) -> np.ndarray:
+        q = self.prepare_query(query_vec)
+        if q is None or not len(self.data):
+            return np.zeros(0, dtype=np.int64)
+        scores = self.scores(q)
+        k = min(k, len(scores))
+        idx = np.argpartition(-scores, k - 1)[:k]
+        return idx[np.argsort(-scores[idx])]
@@ -0,0 +1,29 @@
+# ================================
+# 🗺️ قائمة الأماكن المعروفة (gazetteer)
+# ================================
+# الأماكن صارت بملف JSON (الاسم ← العنوان الكامل) بدل ما تكون منسوخة بكذا ملف،
+# والتطبيق و seed_places.py بيقروها من هون. كل مدينة إلها ملف بـ
+# data/gazetteer/<مفتاح المدينة>.json (المفاتيح بـ data/cities.json).
+import json
+import os
+from typing import Dict
+
+GAZETTEER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gazetteer")
+DEFAULT_GAZETTEER = os.path.join(GAZETTEER_DIR, "damascus.json")
+
+
+def load_gazetteer(path: str = DEFAULT_GAZETTEER) -> Dict[str, str]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def city_gazetteer_path(city_key: str, directory: str = GAZETTEER_DIR) -> str:
+    return os.path.join(directory, f"{city_key}.json")
+
+
+def load_city_gazetteer(city_key: str, directory: str = GAZETTEER_DIR) -> Dict[str, str]:
+    # مدينة ما إلها ملف لسا: بدون أماكن محلية، والبحث بيعتمد على Pinecone و Google
+    path = city_gazetteer_path(city_key, directory)
+    if not os.path.exists(path):
+        return {}
+    return load_gazetteer(path)
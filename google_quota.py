@@ -0,0 +1,122 @@
+# ================================
+# 🚦 جدولة طلبات Google حسب الأولوية وحصة الـ QPS
+# ================================
+# token bucket لكل API من Google، ولكل طلب صنف أولوية:
+#   INTERACTIVE: بحث الوجهة/الانطلاق وقت المحادثة (أعلى أولوية)
+#   SUMMARY:     المسافة وقت ملخص الطلب
+#   BACKGROUND:  reverse geocode ببداية الجلسة، شغل الـ batch، تسخين الكاش
+# الأصناف الأقل ما بتقدر تاخد من الاحتياطي المحجوز للأعلى منها، وإذا ما لقت
+# مكان خلال مهلتها بتنرفض (shed) والمنادي بيرجع لجواب من الكاش أو محلي.
+# الـ buckets بذاكرة كل عملية: مع N workers الحصة المضبوطة (إجمالي الخدمة)
+# لازم تنقسم على N (parse_limits(..., workers=N))، غير هيك المعدل الفعلي N ضعف.
+# سعة الـ bucket أقلها ceil(1/(1-reserve)) مشان حصة صغيرة (متل directions=2 على
+# 2 workers) ما تضل تحت الاحتياطي وترفض كل طلبات الملخص والخلفية. حصة 0 = API مسكّر.
+import math
+import threading
+import time
+from typing import Dict, Optional
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_SUMMARY = 1
+PRIORITY_BACKGROUND = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_SUMMARY: "summary",
+    PRIORITY_BACKGROUND: "background",
+}
+
+# نسبة من سعة الـ bucket محجوزة للأصناف الأعلى
+DEFAULT_RESERVE = {PRIORITY_INTERACTIVE: 0.0, PRIORITY_SUMMARY: 0.2, PRIORITY_BACKGROUND: 0.5}
+# أقصى انتظار (ثواني) قبل رفض الطلب
+DEFAULT_MAX_WAIT = {PRIORITY_INTERACTIVE: 3.0, PRIORITY_SUMMARY: 1.0, PRIORITY_BACKGROUND: 0.5}
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+
+def min_burst(reserve: Dict[int, float]) -> int:
+    # أصغر سعة بتخلي bucket مليان يقبل طلب من كل صنف فوق احتياطه
+    return max([math.ceil(1 / (1 - r) - 1e-9) for r in reserve.values() if r < 1] + [1])
+
+
+class GoogleQuotaScheduler:
+    def __init__(self, limits: Dict[str, float], reserve: Optional[Dict[int, float]] = None,
+                 max_wait: Optional[Dict[int, float]] = None):
+        self.reserve = reserve or dict(DEFAULT_RESERVE)
+        burst = min_burst(self.reserve)
+        self._buckets = {api: TokenBucket(qps, max(qps, burst)) for api, qps in limits.items()}
+        self.max_wait = max_wait or dict(DEFAULT_MAX_WAIT)
+        self._cond = threading.Condition()
+        self._waiting = {api: {p: 0 for p in PRIORITY_NAMES} for api in limits}
+        self._admitted = {api: {p: 0 for p in PRIORITY_NAMES} for api in limits}
+        self._shed = {api: {p: 0 for p in PRIORITY_NAMES} for api in limits}
+
+    def acquire(self, api: str, priority: int = PRIORITY_INTERACTIVE) -> bool:
+        bucket = self._buckets.get(api)
+        if bucket is None:
+            return True
+        if bucket.rate <= 0:
+            with self._cond:
+                self._shed[api][priority] += 1
+            return False
+        deadline = time.monotonic() + self.max_wait.get(priority, 0.0)
+        floor = self.reserve.get(priority, 0.0) * bucket.capacity
+        with self._cond:
+            waiting = self._waiting[api]
+            waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    bucket.refill(now)
+                    higher_waiting = any(waiting[p] for p in waiting if p < priority)
+                    if not higher_waiting and bucket.tokens - 1 >= floor:
+                        bucket.tokens -= 1
+                        self._admitted[api][priority] += 1
+                        return True
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._shed[api][priority] += 1
+                        return False
+                    needed = max(floor + 1 - bucket.tokens, 0.0)
+                    self._cond.wait(min(remaining, max(needed / bucket.rate, 0.005)))
+            finally:
+                waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def stats(self) -> Dict[str, dict]:
+        with self._cond:
+            now = time.monotonic()
+            result = {}
+            for api, bucket in self._buckets.items():
+                bucket.refill(now)
+                result[api] = {
+                    "qps": bucket.rate,
+                    "tokens": round(bucket.tokens, 2),
+                    "queue_depth": {PRIORITY_NAMES[p]: n for p, n in self._waiting[api].items()},
+                    "admitted": {PRIORITY_NAMES[p]: n for p, n in self._admitted[api].items()},
+                    "shed": {PRIORITY_NAMES[p]: n for p, n in self._shed[api].items()},
+                }
+            return result
+
+
+def parse_limits(spec: str, apis, default_qps: float, workers: int = 1) -> Dict[str, float]:
+    # صيغة: "autocomplete=50,directions=20" (إجمالي لكل الـ workers) ← حصة هالعملية
+    limits = {api: default_qps for api in apis}
+    for part in spec.split(","):
+        api, _, value = part.partition("=")
+        if api.strip() and value.strip():
+            limits[api.strip()] = max(0.0, float(value))
+    workers = max(1, workers)
+    return {api: qps / workers for api, qps in limits.items()}
@@ -0,0 +1,147 @@
+# ================================
+# 🧮 مطابقة الأماكن خارج الـ event loop (process pool)
+# ================================
+# difflib وحساب التشابه على كل الأماكن شغل CPU بيكبر مع الـ gazetteer.
+# هون منبعته لـ process pool، والـ workers بيقروا مصفوفة الـ embeddings وقائمة
+# الأسماء من shared memory مباشرة بدل ما تنعمل pickle مع كل طلب.
+# MATCH_POOL_SIZE=0 معناها التنفيذ بنفس العملية (نفس الواجهة).
+# المصفوفة محفوظة بـ EmbeddingStore (float32 / float16 / int8 مع قص الأبعاد).
+import difflib
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from embedding_store import EmbeddingStore
+
+# حالة كل worker (بتتعبى مرة وحدة بالـ initializer)
+_worker_names: List[str] = []
+_worker_store: Optional[EmbeddingStore] = None
+_worker_shm: List[SharedMemory] = []
+
+
+def close_matches_in(names: Sequence[str], query: str, n: int, cutoff: float) -> List[str]:
+    return difflib.get_close_matches(query, names, n=n, cutoff=cutoff)
+
+
+def best_match_in(names: Sequence[str], store: EmbeddingStore, query_vec) -> Tuple[Optional[str], float]:
+    if not len(names):
+        return None, 0.0
+    idx, score = store.best(query_vec)
+    if idx < 0:
+        return None, 0.0
+    return names[idx], score
+
+
+# ---------------- داخل الـ worker ----------------
+def _init_worker(spec: dict):
+    # الـ workers (spawn) بيشاركوا الـ resource tracker مع العملية الأم،
+    # فالعملية الأم لحالها بتحذف الذاكرة المشتركة بالـ close
+    global _worker_names, _worker_store, _worker_shm
+    names_shm = SharedMemory(name=spec["names_shm"])
+    _worker_shm = [names_shm]
+    blob = bytes(names_shm.buf[:spec["names_len"]]).decode("utf-8")
+    _worker_names = blob.split("\n") if blob else []
+    arrays = {}
+    for key, info in spec["arrays"].items():
+        shm = SharedMemory(name=info["shm"])
+        _worker_shm.append(shm)
+        arrays[key] = np.ndarray(tuple(info["shape"]), dtype=np.dtype(info["dtype"]), buffer=shm.buf)
+    _worker_store = EmbeddingStore(arrays["data"], arrays.get("scales"))
+
+
+def _worker_close_matches(query: str, n: int, cutoff: float) -> List[str]:
+    return close_matches_in(_worker_names, query, n, cutoff)
+
+
+def _worker_best_match(query_vec) -> Tuple[Optional[str], float]:
+    return best_match_in(_worker_names, _worker_store, query_vec)
+
+
+def _worker_ping() -> int:
+    return len(_worker_names)
+
+
+# ---------------- الواجهة ----------------
+class PlaceMatcher:
+    def __init__(self, names: Sequence[str], matrix, pool_size: int = 0,
+                 dtype: str = "float32", dims: int = 0):
+        self.names = list(names)
+        if len(self.names):
+            store = EmbeddingStore.build(matrix, dtype=dtype, dims=dims)
+        else:
+            store = EmbeddingStore.build(np.zeros((0, 1), dtype=np.float32), dtype=dtype)
+        self.pool_size = pool_size
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._shm: List[SharedMemory] = []
+        if pool_size > 0:
+            self.store = self._share(store)
+        else:
+            self.store = store
+
+    def _share(self, store: EmbeddingStore) -> EmbeddingStore:
+        blob = "\n".join(self.names).encode("utf-8")
+        names_shm = SharedMemory(create=True, size=max(len(blob), 1))
+        names_shm.buf[:len(blob)] = blob
+        self._shm = [names_shm]
+        shared: Dict[str, np.ndarray] = {}
+        arrays_spec = {}
+        for key, array in store.arrays().items():
+            shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+            shared[key] = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+            shared[key][:] = array
+            self._shm.append(shm)
+            arrays_spec[key] = {"shm": shm.name, "shape": list(array.shape), "dtype": array.dtype.str}
+        spec = {
+            "names_shm": names_shm.name,
+            "names_len": len(blob),
+            "arrays": arrays_spec,
+        }
+        # spawn بدل fork: العملية الأم فيها threads (uvicorn, outbox)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.pool_size,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(spec,),
+        )
+        return EmbeddingStore(shared["data"], shared.get("scales"))
+
+    def warm_up(self):
+        # تشغيل الـ workers مسبقاً حتى أول طلب ما يدفع كلفة الـ spawn
+        if self._pool:
+            for fut in [self._pool.submit(_worker_ping) for _ in range(self.pool_size)]:
+                fut.result()
+
+    def close_matches(self, query: str, n: int = 1, cutoff: float = 0.6) -> List[str]:
+        if self._pool:
+            return self._pool.submit(_worker_close_matches, query, n, cutoff).result()
+        return close_matches_in(self.names, query, n, cutoff)
+
+    def best_embedding_match(self, query_vec) -> Tuple[Optional[str], float]:
+        if self._pool:
+            return self._pool.submit(_worker_best_match, np.asarray(query_vec, dtype=np.float32)).result()
+        return best_match_in(self.names, self.store, query_vec)
+
+    def stats(self) -> dict:
+        return {
+            "places": len(self.names),
+            "dtype": self.store.dtype,
+            "dims": self.store.dims,
+            "bytes": self.store.nbytes,
+            "pool_size": self.pool_size,
+        }
+
+    def close(self):
+        if self._pool:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        # نسخة عادية من المصفوفات حتى يضل الـ matcher شغال بنفس العملية
+        arrays = {key: np.array(array) for key, array in self.store.arrays().items()}
+        self.store = EmbeddingStore(arrays["data"], arrays.get("scales"))
+        self.pool_size = 0
+        for shm in self._shm:
+            shm.close()
+            shm.unlink()
+        self._shm = []
@@ -0,0 +1,117 @@
+# ================================
+# 🔤 embedding محلي من char n-grams (بدون شبكة)
+# ================================
+# أسماء الأماكن عنا قصيرة، فـ hashing لـ n-grams الحروف (بعد توحيد الكتابة
+# العربية: الهمزات، التاء المربوطة، الألف المقصورة، التشكيل) بيكفي لمعظم
+# الاستعلامات. الـ embedding حتمي وبياخد ميكروثواني، فبينحسب للـ gazetteer كله
+# عند الإقلاع ولكل استعلام بدون OpenAI.
+#
+# التشابه لحاله بيقبل "مول قاسيون" ← "قاسيون" (0.8): token_coverage بتتأكد إن كل
+# كلمة بالاستعلام إلها كلمة قريبة منها باسم المكان قبل ما نقبل النتيجة محلياً.
+import difflib
+import re
+import zlib
+from functools import lru_cache
+from typing import AbstractSet, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_DIM = 1024
+DEFAULT_NGRAMS = (2, 3, 4)
+
+_DIACRITICS_RE = re.compile(r"[ً-ْٰـ]")  # تشكيل + تطويل
+_NON_WORD_RE = re.compile(r"[^\w\s]")
+_CHAR_MAP = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ى": "ي", "ة": "ه", "ؤ": "و", "ئ": "ي"})
+# كلمات ما بتفرق بين الأماكن بأي مدينة، وكل فهرس بيضيف كلمات مدينته (stop_words بـ data/cities.json)
+_STOP_WORDS = {"سوريا", "سورية"}
+
+
+def normalize_arabic(text: str, stop_words: AbstractSet[str] = frozenset()) -> str:
+    # stop_words لازم تكون موحدة الكتابة (normalize_arabic بدون stop words)
+    text = _DIACRITICS_RE.sub("", text.lower()).translate(_CHAR_MAP)
+    words = [w for w in _NON_WORD_RE.sub(" ", text).split() if w not in stop_words]
+    return " ".join(words)
+
+
+@lru_cache(maxsize=65536)
+def _bucket(gram: str, dim: int) -> Tuple[int, float]:
+    h = zlib.crc32(gram.encode("utf-8"))
+    return h % dim, 1.0 if (h >> 31) & 1 else -1.0
+
+
+class NgramEmbedder:
+    def __init__(self, dim: int = DEFAULT_DIM, ngrams: Sequence[int] = DEFAULT_NGRAMS,
+                 stop_words: Iterable[str] = ()):
+        self.dim = dim
+        self.ngrams = tuple(ngrams)
+        self.stop_words = frozenset(normalize_arabic(w) for w in _STOP_WORDS.union(stop_words))
+
+    def words(self, text: str) -> List[str]:
+        words = []
+        for word in normalize_arabic(text, self.stop_words).split():
+            # بدون "ال" التعريف، مشان "برامكة" تطابق "البرامكة"
+            if word.startswith("ال") and len(word) > 4:
+                word = word[2:]
+            words.append(word)
+        return words
+
+    def grams(self, text: str) -> List[str]:
+        grams = []
+        for word in self.words(text):
+            padded = f"<{word}>"
+            for n in self.ngrams:
+                grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+        return grams
+
+    def embed(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for gram in self.grams(text):
+            idx, sign = _bucket(gram, self.dim)
+            vec[idx] += sign
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else vec
+
+    def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack([self.embed(t) for t in texts])
+
+
+class NgramIndex:
+    # بحث cosine بنفس العملية: المصفوفة صغيرة والاستعلام ميكروثواني، ما بيستاهل process pool
+    def __init__(self, names: Sequence[str], embedder: NgramEmbedder):
+        self.names = list(names)
+        self.embedder = embedder
+        self.matrix = embedder.embed_many(self.names)
+
+    def coverage(self, query: str, name: str) -> float:
+        return token_coverage(self.embedder.words(query), self.embedder.words(name))
+
+    def search(self, query: str, top_k: int = 3) -> List[Tuple[str, float]]:
+        if not self.names:
+            return []
+        scores = self.matrix @ self.embedder.embed(query)
+        top = np.argsort(-scores)[:top_k]
+        return [(self.names[i], float(scores[i])) for i in top]
+
+
+def token_coverage(query_words: Sequence[str], name_words: Sequence[str], min_ratio: float = 0.65) -> float:
+    # نسبة كلمات الاستعلام يلي إلها كلمة قريبة (أخطاء كتابة) باسم المكان، أو كلمتين
+    # ورا بعض لازقين ("شارعالنصر")
+    if not query_words:
+        return 0.0
+    candidates = list(name_words) + [a + b for a, b in zip(name_words, name_words[1:])]
+    covered = sum(
+        any(difflib.SequenceMatcher(None, q, n).ratio() >= min_ratio for n in candidates)
+        for q in query_words
+    )
+    return covered / len(query_words)
+
+
+def is_confident(matches: Sequence[Tuple[str, float]], threshold: float, floor: float, margin: float) -> bool:
+    # واثقين إذا التشابه عالي، أو مقبول وبعيد بوضوح عن تاني أقرب مكان
+    if not matches:
+        return False
+    top = matches[0][1]
+    second = matches[1][1] if len(matches) > 1 else 0.0
+    return top >= threshold or (top >= floor and top - second >= margin)
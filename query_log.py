@@ -0,0 +1,129 @@
+# ================================
+# 📈 سجل تكرار الاستعلامات (للتسخين بعد الـ deploy)
+# ================================
+# منعد الاستعلامات (وجهة، انطلاق، عناوين الملخص) بعد توحيدها بالذاكرة، وكل
+# flush_interval منضيف المجاميع للملف بسطور "العدد<TAB>النوع<TAB>الاستعلام".
+# لما الملف يكبر عن max_bytes بيتدوّر (path.1 ... path.N) متل RotatingFileHandler.
+# top() بيجمع الملف والنسخ القديمة (الأقدم وزنه أقل) ومنه بيقرا الـ warmer.
+# كذا worker بيكتبوا على نفس الملف: الـ flush (التدوير مع الـ append) ماسك flock على
+# path.lock، فعمليتين ما بيدوّروا سوا ولا بيضيع أو بيتكرر ملف.
+import os
+import threading
+from contextlib import contextmanager
+from collections import Counter
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: القفل بين العمليات مو متاح، بيضل قفل الـ threads بس
+    fcntl = None
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class QueryLog:
+    def __init__(self, path: str, max_bytes: int = 1_000_000, backups: int = 3,
+                 flush_interval: float = 10.0, decay: float = 0.5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.decay = decay
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.recorded = 0
+
+    def record(self, kind: str, query: Optional[str]):
+        q = normalize_query(query or "")
+        if not q:
+            return
+        with self._lock:
+            self._counts[(kind, q)] += 1
+            self.recorded += 1
+
+    def flush(self):
+        with self._lock:
+            pending, self._counts = self._counts, Counter()
+        if not pending:
+            return
+        data = "".join(f"{n}\t{kind}\t{q}\n" for (kind, q), n in pending.items()).encode("utf-8")
+        with self._file_lock, self._process_lock():
+            self._rotate_if_needed(len(data))
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+
+    @contextmanager
+    def _process_lock(self):
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(f"{self.path}.lock", os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _rotate_if_needed(self, incoming: int):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size + incoming <= self.max_bytes:
+            return
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def top(self, n: int, kinds: Optional[Sequence[str]] = None) -> List[Tuple[str, str, float]]:
+        # [(النوع، الاستعلام، الوزن)] من الأكثر تكراراً
+        totals: Counter = Counter()
+        files = [self.path] + [f"{self.path}.{i}" for i in range(1, self.backups + 1)]
+        for age, path in enumerate(files):
+            weight = self.decay ** age
+            try:
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        parts = line.rstrip("\n").split("\t", 2)
+                        if len(parts) == 3 and parts[0].isdigit():
+                            totals[(parts[1], parts[2])] += int(parts[0]) * weight
+            except OSError:
+                continue
+        with self._lock:
+            totals.update(self._counts)
+        return [
+            (kind, q, weight) for (kind, q), weight in totals.most_common()
+            if kinds is None or kind in kinds
+        ][:n]
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError as e:
+                print("خطأ بكتابة سجل الاستعلامات:", e)
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="query-log", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
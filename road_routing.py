@@ -0,0 +1,299 @@
+# ================================
+# 🛣️ توجيه محلي على شبكة طرق (بدون Google Directions)
+# ================================
+# الشبكة بتنحمل من ملف .npz (بينبنى من OSM بـ build_road_graph.py) وبتنخزن
+# بشكل CSR بمصفوفات مضغوطة: لكل عقدة مجال من الأضلاع الطالعة منها.
+# الاستعلام: snap لأقرب عقدة (مع كاش)، وبعدين A* على زمن الرحلة، ومنرجع
+# المسافة (كم) والزمن المتوقع (دقائق) لأسرع طريق.
+import heapq
+import math
+import threading
+import xml.etree.ElementTree as ET
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+
+# سرعات افتراضية (كم/س) حسب نوع الطريق إذا ما في maxspeed
+DRIVE_SPEEDS_KMH = {
+    "motorway": 90, "motorway_link": 50, "trunk": 70, "trunk_link": 40,
+    "primary": 50, "primary_link": 35, "secondary": 40, "secondary_link": 30,
+    "tertiary": 35, "tertiary_link": 25, "unclassified": 25, "residential": 20,
+    "living_street": 10, "service": 15, "road": 25,
+}
+
+GRID_CELL_DEG = 0.002      # ~200 متر
+MAX_SNAP_M = 1500.0        # أبعد من هيك النقطة برا الشبكة
+MAX_SETTLED_NODES = 300000
+
+
+def _haversine_m(lat1, lng1, lat2, lng2):
+    p1, p2 = np.radians(lat1), np.radians(lat2)
+    dp, dl = p2 - p1, np.radians(np.asarray(lng2) - np.asarray(lng1))
+    a = np.sin(dp / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def _typed(kind: str, values: np.ndarray) -> array:
+    arr = array(kind)
+    arr.frombytes(np.ascontiguousarray(values, dtype=np.dtype(kind)).tobytes())
+    return arr
+
+
+class RoadGraph:
+    def __init__(self, node_lat, node_lng, indptr, indices, length_m, time_s,
+                 snap_cache_size: int = 50000, route_cache_size: int = 10000):
+        node_lat = np.asarray(node_lat, dtype=np.float64)
+        node_lng = np.asarray(node_lng, dtype=np.float64)
+        self.node_count = len(node_lat)
+        self.edge_count = len(indices)
+        # مصفوفات مضغوطة (array) لأن الوصول لعنصر واحد منها أسرع من numpy بالـ loops
+        self._lat = _typed("d", node_lat)
+        self._lng = _typed("d", node_lng)
+        self._indptr = _typed("q", indptr)
+        self._indices = _typed("i", indices)
+        self._length = _typed("f", length_m)
+        self._time = _typed("f", time_s)
+        speeds = np.asarray(length_m, dtype=np.float64) / np.maximum(np.asarray(time_s, dtype=np.float64), 1e-3)
+        self._max_speed_mps = float(speeds.max()) if len(speeds) else 1.0
+        self._build_grid(node_lat, node_lng, np.diff(np.asarray(indptr)) > 0)
+        self._lock = threading.Lock()
+        self._snap_cache: "OrderedDict[Tuple[float, float], Optional[Tuple[int, float]]]" = OrderedDict()
+        self._route_cache: "OrderedDict[Tuple[int, int], Optional[Tuple[float, float]]]" = OrderedDict()
+        self._snap_cache_size = snap_cache_size
+        self._route_cache_size = route_cache_size
+        self.snap_hits = 0
+        self.snap_misses = 0
+
+    # ---------------- تحميل وحفظ ----------------
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "RoadGraph":
+        data = np.load(path)
+        return cls(data["node_lat"], data["node_lng"], data["indptr"], data["indices"],
+                   data["length_m"], data["time_s"], **kwargs)
+
+    @classmethod
+    def from_edges(cls, node_lat, node_lng, src, dst, length_m, time_s, **kwargs) -> "RoadGraph":
+        arrays = csr_from_edges(len(node_lat), src, dst, length_m, time_s)
+        return cls(node_lat, node_lng, *arrays, **kwargs)
+
+    def save(self, path: str):
+        np.savez_compressed(
+            path,
+            node_lat=np.frombuffer(self._lat, dtype=np.float64),
+            node_lng=np.frombuffer(self._lng, dtype=np.float64),
+            indptr=np.frombuffer(self._indptr, dtype=np.int64),
+            indices=np.frombuffer(self._indices, dtype=np.int32),
+            length_m=np.frombuffer(self._length, dtype=np.float32),
+            time_s=np.frombuffer(self._time, dtype=np.float32),
+        )
+
+    def memory_bytes(self) -> int:
+        return sum(a.itemsize * len(a) for a in (self._lat, self._lng, self._indptr, self._indices, self._length, self._time))
+
+    # ---------------- snapping ----------------
+    def _build_grid(self, lat: np.ndarray, lng: np.ndarray, has_out: np.ndarray):
+        candidates = np.nonzero(has_out)[0].astype(np.int32)
+        cy = np.floor(lat[candidates] / GRID_CELL_DEG).astype(np.int64)
+        cx = np.floor(lng[candidates] / GRID_CELL_DEG).astype(np.int64)
+        order = np.lexsort((cx, cy))
+        cy, cx, candidates = cy[order], cx[order], candidates[order]
+        self._grid: Dict[Tuple[int, int], np.ndarray] = {}
+        if not len(candidates):
+            return
+        breaks = np.nonzero((np.diff(cy) != 0) | (np.diff(cx) != 0))[0] + 1
+        for chunk_y, chunk_x, chunk in zip(np.split(cy, breaks), np.split(cx, breaks), np.split(candidates, breaks)):
+            self._grid[(int(chunk_y[0]), int(chunk_x[0]))] = chunk
+        self._grid_lat = lat
+        self._grid_lng = lng
+
+    def _nearest_node(self, lat: float, lng: float) -> Optional[Tuple[int, float]]:
+        if not self._grid:
+            return None
+        cy, cx = int(math.floor(lat / GRID_CELL_DEG)), int(math.floor(lng / GRID_CELL_DEG))
+        ring_m = GRID_CELL_DEG * 111000 * math.cos(math.radians(lat))
+        max_ring = int(MAX_SNAP_M / ring_m) + 1
+        best, best_d = None, float("inf")
+        for r in range(max_ring + 1):
+            cells = [self._grid.get((cy + dy, cx + dx))
+                     for dy in range(-r, r + 1) for dx in range(-r, r + 1)
+                     if max(abs(dy), abs(dx)) == r]
+            cells = [c for c in cells if c is not None]
+            if cells:
+                idx = np.concatenate(cells)
+                d = _haversine_m(lat, lng, self._grid_lat[idx], self._grid_lng[idx])
+                i = int(np.argmin(d))
+                if d[i] < best_d:
+                    best, best_d = int(idx[i]), float(d[i])
+            # أي عقدة بحلقة أبعد رح تكون أبعد من (r * عرض الخلية)
+            if best is not None and best_d <= r * ring_m:
+                break
+        if best is None or best_d > MAX_SNAP_M:
+            return None
+        return best, best_d
+
+    def snap(self, lat: float, lng: float) -> Optional[Tuple[int, float]]:
+        key = (round(lat, 4), round(lng, 4))
+        with self._lock:
+            if key in self._snap_cache:
+                self._snap_cache.move_to_end(key)
+                self.snap_hits += 1
+                return self._snap_cache[key]
+            self.snap_misses += 1
+        result = self._nearest_node(lat, lng)
+        with self._lock:
+            self._snap_cache[key] = result
+            if len(self._snap_cache) > self._snap_cache_size:
+                self._snap_cache.popitem(last=False)
+        return result
+
+    # ---------------- A* ----------------
+    def _astar(self, source: int, target: int) -> Optional[Tuple[float, float]]:
+        if source == target:
+            return 0.0, 0.0
+        lat, lng = self._lat, self._lng
+        indptr, indices, length, travel = self._indptr, self._indices, self._length, self._time
+        t_lat, t_lng = math.radians(lat[target]), math.radians(lng[target])
+        cos_t = math.cos(t_lat)
+        # heuristic: أقصر مسافة ممكنة على أعلى سرعة بالشبكة (ما بتبالغ بالتقدير)
+        scale = EARTH_RADIUS_M / self._max_speed_mps * 0.995
+
+        def h(n):
+            dy = math.radians(lat[n]) - t_lat
+            dx = (math.radians(lng[n]) - t_lng) * cos_t
+            return math.sqrt(dx * dx + dy * dy) * scale
+
+        best_time = array("d", [math.inf]) * self.node_count
+        best_dist = array("d", [0.0]) * self.node_count
+        best_time[source] = 0.0
+        heap = [(h(source), 0.0, source)]
+        settled = 0
+        while heap:
+            _, g, u = heapq.heappop(heap)
+            if u == target:
+                return best_dist[u], g
+            if g > best_time[u]:
+                continue  # نسخة قديمة بالـ heap
+            settled += 1
+            if settled > MAX_SETTLED_NODES:
+                return None
+            du = best_dist[u]
+            for e in range(indptr[u], indptr[u + 1]):
+                v = indices[e]
+                ng = g + travel[e]
+                if ng < best_time[v]:
+                    best_time[v] = ng
+                    best_dist[v] = du + length[e]
+                    heapq.heappush(heap, (ng + h(v), ng, v))
+        return None
+
+    def route(self, from_lat: float, from_lng: float, to_lat: float, to_lng: float) -> Optional[Tuple[float, float]]:
+        # بيرجع (المسافة كم، الزمن دقائق) أو None إذا النقاط برا الشبكة أو ما في طريق
+        src = self.snap(from_lat, from_lng)
+        dst = self.snap(to_lat, to_lng)
+        if src is None or dst is None:
+            return None
+        key = (src[0], dst[0])
+        with self._lock:
+            cached = self._route_cache.get(key, False)
+            if cached is not False:
+                self._route_cache.move_to_end(key)
+        if cached is False:
+            cached = self._astar(*key)
+            with self._lock:
+                self._route_cache[key] = cached
+                if len(self._route_cache) > self._route_cache_size:
+                    self._route_cache.popitem(last=False)
+        if cached is None:
+            return None
+        meters, seconds = cached
+        # الوصول من/إلى أقرب عقدة بسرعة حارة سكنية
+        access_m = src[1] + dst[1]
+        meters += access_m
+        seconds += access_m / (DRIVE_SPEEDS_KMH["residential"] / 3.6)
+        return round(meters / 1000, 2), round(seconds / 60, 1)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "nodes": self.node_count,
+                "edges": self.edge_count,
+                "bytes": self.memory_bytes(),
+                "snap_cache": len(self._snap_cache),
+                "snap_hits": self.snap_hits,
+                "snap_misses": self.snap_misses,
+                "route_cache": len(self._route_cache),
+            }
+
+
+def csr_from_edges(node_count: int, src, dst, length_m, time_s):
+    src = np.asarray(src, dtype=np.int64)
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=node_count), out=indptr[1:])
+    return (
+        indptr,
+        np.asarray(dst, dtype=np.int32)[order],
+        np.asarray(length_m, dtype=np.float32)[order],
+        np.asarray(time_s, dtype=np.float32)[order],
+    )
+
+
+# ---------------- بناء الشبكة من OSM ----------------
+def _speed_kmh(tags: Dict[str, str]) -> float:
+    raw = tags.get("maxspeed", "").split(" ")[0]
+    if raw.isdigit():
+        return float(raw)
+    return float(DRIVE_SPEEDS_KMH[tags["highway"]])
+
+
+def build_from_osm(osm_path: str) -> RoadGraph:
+    node_coords: Dict[int, Tuple[float, float]] = {}
+    ways: List[Tuple[List[int], Dict[str, str]]] = []
+    for _, elem in ET.iterparse(osm_path, events=("end",)):
+        if elem.tag == "node":
+            node_coords[int(elem.get("id"))] = (float(elem.get("lat")), float(elem.get("lon")))
+            elem.clear()
+        elif elem.tag == "way":
+            tags = {t.get("k"): t.get("v") for t in elem.findall("tag")}
+            if tags.get("highway") in DRIVE_SPEEDS_KMH and tags.get("access") not in ("private", "no"):
+                ways.append(([int(nd.get("ref")) for nd in elem.findall("nd")], tags))
+            elem.clear()
+
+    index: Dict[int, int] = {}
+    src: List[int] = []
+    dst: List[int] = []
+    speeds: List[float] = []
+    for refs, tags in ways:
+        refs = [r for r in refs if r in node_coords]
+        oneway = tags.get("oneway", "no")
+        forward = oneway != "-1"
+        backward = oneway in ("no", "false", "0") and tags.get("junction") != "roundabout" \
+            and tags.get("highway") not in ("motorway",)
+        if oneway == "-1":
+            backward = True
+        speed = _speed_kmh(tags)
+        for a, b in zip(refs, refs[1:]):
+            ia = index.setdefault(a, len(index))
+            ib = index.setdefault(b, len(index))
+            if forward:
+                src.append(ia)
+                dst.append(ib)
+                speeds.append(speed)
+            if backward:
+                src.append(ib)
+                dst.append(ia)
+                speeds.append(speed)
+
+    node_lat = np.empty(len(index), dtype=np.float64)
+    node_lng = np.empty(len(index), dtype=np.float64)
+    for osm_id, i in index.items():
+        node_lat[i], node_lng[i] = node_coords[osm_id]
+    src_arr = np.asarray(src, dtype=np.int64)
+    dst_arr = np.asarray(dst, dtype=np.int64)
+    length = _haversine_m(node_lat[src_arr], node_lng[src_arr], node_lat[dst_arr], node_lng[dst_arr])
+    travel = length / (np.asarray(speeds, dtype=np.float64) / 3.6)
+    return RoadGraph.from_edges(node_lat, node_lng, src_arr, dst_arr, length, travel)
@@ -1,8 +1,12 @@
 import pinecone
 from openai import OpenAI
 import os
+import sys
 import time
 
+from cities import load_cities
+from gazetteer import load_city_gazetteer
+
 # ================================
 # 🔐 مفاتيح API
 # ================================
@@ -38,145 +42,14 @@ def get_embedding(text):
     return response.data[0].embedding
 
 # ================================
-# 🗺️ قائمة الأماكن (اختصرنا – كمثال)
+# 🗺️ قائمة أماكن المدينة (data/gazetteer/<المدينة>.json)
 # ================================
-known_places_embedding = {
-
-
-"الجورة": "الجورة، دمشق، سوريا",
-    "العمارة الجوانية": "العمارة الجوانية، دمشق، سوريا",
-    "باب توما": "باب توما، دمشق، سوريا",
-    "القيمرية": "القيمرية، دمشق، سوريا",
-    "الحميدية": "الحميدية، دمشق، سوريا",
-    "الحريقة": "الحريقة، دمشق، سوريا",
-    "الأمين": "الأمين، دمشق، سوريا",
-    "مئذنة الشحم": "مئذنة الشحم، دمشق، سوريا",
-    "شاغور جواني": "شاغور جواني، دمشق، سوريا",
-    "سوق ساروجة": "سوق ساروجة، دمشق، سوريا",
-    "العقيبة": "العقيبة، دمشق، سوريا",
-    "العمارة البرانية": "العمارة البرانية، دمشق، سوريا",
-    "مسجد الأقصاب": "مسجد الأقصاب، دمشق، سوريا",
-    "القصاع": "القصاع، دمشق، سوريا",
-    "العدوي": "العدوي، دمشق، سوريا",
-    "القصور": "القصور، دمشق، سوريا",
-    "فارس الخوري": "فارس الخوري، دمشق، سوريا",
-    "القنوات": "القنوات، دمشق، سوريا",
-    "الحجاز": "الحجاز، دمشق، سوريا",
-    "البرامكة": "البرامكة، دمشق، سوريا",
-    "باب الجابية": "باب الجابية، دمشق، سوريا",
-    "باب سريجة": "باب سريجة، دمشق، سوريا",
-    "السويقة": "السويقة، دمشق، سوريا",
-    "قبر عاتكة": "قبر عاتكة، دمشق، سوريا",
-    "المجتهد": "المجتهد، دمشق، سوريا",
-    "الأنصاري": "الأنصاري، دمشق، سوريا",
-    "جوبر الشرقي": "جوبر الشرقي، دمشق، سوريا",
-    "جوبر الغربي": "جوبر الغربي، دمشق، سوريا",
-    "المأمونية": "المأمونية، دمشق، سوريا",
-    "الاستقلال": "الاستقلال، دمشق، سوريا",
-    "ميدان وسطاني": "ميدان وسطاني، دمشق، سوريا",
-    "الزاهرة": "الزاهرة، دمشق، سوريا",
-    "الحقلة": "الحقلة، دمشق، سوريا",
-    "الدقاق": "الدقاق، دمشق، سوريا",
-    "القاعة": "القاعة، دمشق، سوريا",
-    "باب مصلى": "باب مصلى، دمشق، سوريا",
-    "شاغور براني": "شاغور براني، دمشق، سوريا",
-    "باب شرقي": "باب شرقي، دمشق، سوريا",
-    "ابن عساكر": "ابن عساكر، دمشق، سوريا",
-    "النضال": "النضال، دمشق، سوريا",
-    "الوحدة": "الوحدة، دمشق، سوريا",
-    "بلال": "بلال، دمشق، سوريا",
-    "روضة الميدان": "روضة الميدان، دمشق، سوريا",
-    "الزهور": "الزهور، دمشق، سوريا",
-    "التضامن": "التضامن، دمشق، سوريا",
-    "السيدة عائشة": "السيدة عائشة، دمشق، سوريا",
-    "القدم": "القدم، دمشق، سوريا",
-    "المصطفى": "المصطفى، دمشق، سوريا",
-    "الشريباتي": "الشريباتي، دمشق، سوريا",
-    "العسالي": "العسالي، دمشق، سوريا",
-    "القدم الشرقي": "القدم الشرقي، دمشق، سوريا",
-    "كفرسوسة البلد": "كفرسوسة البلد، دمشق، سوريا",
-    "الإخلاص": "الإخلاص، دمشق، سوريا",
-    "الواحة": "الواحة، دمشق، سوريا",
-    "الفردوس": "الفردوس، دمشق، سوريا",
-    "اللوان": "اللوان، دمشق، سوريا",
-    "الربوة": "الربوة، دمشق، سوريا",
-    "المزة القديمة": "المزة القديمة، دمشق، سوريا",
-    "الجلاء": "الجلاء، دمشق، سوريا",
-    "مزة جبل": "مزة جبل، دمشق، سوريا",
-    "فيلات شرقية": "فيلات شرقية، دمشق، سوريا",
-    "فيلات غربية": "فيلات غربية، دمشق، سوريا",
-    "مزة 86": "مزة 86، دمشق، سوريا",
-    "مزة بساتين": "مزة بساتين، دمشق، سوريا",
-    "مشروع دمر": "مشروع دمر، دمشق، سوريا",
-    "دمر الشرقية": "دمر الشرقية، دمشق، سوريا",
-    "دمر الغربية": "دمر الغربية، دمشق، سوريا",
-    "العرين": "العرين، دمشق، سوريا",
-    "الورود": "الورود، دمشق، سوريا",
-    "برزة البلد": "برزة البلد، دمشق، سوريا",
-    "مساكن برزة": "مساكن برزة، دمشق، سوريا",
-    "المنارة": "المنارة، دمشق، سوريا",
-    "العباس": "العباس، دمشق، سوريا",
-    "النزهة": "النزهة، دمشق، سوريا",
-    "عش الورور": "عش الورور، دمشق، سوريا",
-    "تشرين": "تشرين، دمشق، سوريا",
-    "القابون": "القابون، دمشق، سوريا",
-    "المصانع": "المصانع، دمشق، سوريا",
-    "أسد الدين": "أسد الدين، دمشق، سوريا",
-    "النقشبندي": "النقشبندي، دمشق، سوريا",
-    "الأيوبية": "الأيوبية، دمشق، سوريا",
-    "الفيحاء": "الفيحاء، دمشق، سوريا",
-    "قاسيون": "قاسيون، دمشق، سوريا",
-    "أبو جرش": "أبو جرش، دمشق، سوريا",
-    "الشيخ محي الدين": "الشيخ محي الدين، دمشق، سوريا",
-    "المدارس": "المدارس، دمشق، سوريا",
-    "المزرعة": "المزرعة، دمشق، سوريا",
-    "الشهداء": "الشهداء، دمشق، سوريا",
-    "شورى": "شورى، دمشق، سوريا",
-    "المصطبة": "المصطبة، دمشق، سوريا",
-    "المرابط": "المرابط، دمشق، سوريا",
-    "الروضة": "الروضة، دمشق، سوريا",
-    "أبو رمانة": "أبو رمانة، دمشق، سوريا",
-    "المالكي": "المالكي، دمشق، سوريا",
-    "الحبوبي": "الحبوبي، دمشق، سوريا",
-    "الكرمل": "الكرمل، دمشق، سوريا",
-    "شارع الثورة": "شارع الثورة، دمشق، سوريا",
-    "شارع الحمراء": "شارع الحمراء، دمشق، سوريا",
-    "شارع بغداد": "شارع بغداد، دمشق، سوريا",
-    "شارع خالد بن الوليد": "شارع خالد بن الوليد، دمشق، سوريا",
-    "شارع شكري القوتلي": "شارع شكري القوتلي، دمشق، سوريا",
-    "شارع العابد": "شارع العابد، دمشق، سوريا",
-    "شارع النصر": "شارع النصر، دمشق، سوريا",
-    "شارع الصالحية": "شارع الصالحية، دمشق، سوريا",
-    "شارع البدوي": "شارع البدوي، دمشق، سوريا",
-    "سوق الحميدية": "سوق الحميدية، دمشق، سوريا",
-    "سوق مدحت باشا": "سوق مدحت باشا، دمشق، سوريا",
-    "سوق الحريقة": "سوق الحريقة، دمشق، سوريا",
-    "سوق العصرونية": "سوق العصرونية، دمشق، سوريا",
-    "سوق الصاغة": "سوق الصاغة، دمشق، سوريا",
-    "سوق المناخلية": "سوق المناخلية، دمشق، سوريا",
-    "سوق الخياطين": "سوق الخياطين، دمشق، سوريا",
-    "سوق السروجية": "سوق السروجية، دمشق، سوريا",
-    "سوق القباقبية": "سوق القباقبية، دمشق، سوريا",
-    "سوق الهال": "سوق الهال، دمشق، سوريا",
-    "سوق الجزماتية": "سوق الجزماتية، دمشق، سوريا",
-    "سوق الجمعة": "سوق الجمعة، دمشق، سوريا",
-    "سوق الدرويشية": "سوق الدرويشية، دمشق، سوريا",
-    "سوق السنانية": "سوق السنانية، دمشق، سوريا",
-    "سوق السويقة": "سوق السويقة، دمشق، سوريا",
-    "سوق العتيق": "سوق العتيق، دمشق، سوريا",
-    "سوق النحاسين": "سوق النحاسين، دمشق، سوريا",
-    "سوق النحاتين": "سوق النحاتين، دمشق، سوريا",
-    "سوق المهن اليدوية": "سوق المهن اليدوية، دمشق، سوريا",
-    "سوق باب الجابية": "سوق باب الجابية، دمشق، سوريا",
-    "سوق صاروجا": "سوق صاروجا، دمشق، سوريا",
-    "سوق القبيبات": "سوق القبيبات، دمشق، سوريا",
-    "سوق الخجا": "سوق الخجا، دمشق، سوريا",
-    "سوق السكرية": "سوق السكرية، دمشق، سوريا",
-    "سوق السنجقدار": "سوق السنجقدار، دمشق، سوريا",
-    "سوق المسكية": "سوق المسكية، دمشق، سوريا",
-    "سوق الصقالين": "سوق الصقالين، دمشق، سوريا",
-    "سوق الجمرك": "سوق الجمرك، دمشق، سوريا"
-}
+# python seed_places.py aleppo  (بدون مدينة = damascus)، وكل مدينة بـ namespace تبعها
+city_key = sys.argv[1] if len(sys.argv) > 1 else "damascus"
+city = next((c for c in load_cities() if c.key == city_key), None)
+if city is None:
+    sys.exit(f"مدينة غير معروفة: {city_key}")
+known_places_embedding = load_city_gazetteer(city.key)
 
 # ================================
 # ⬆️ رفع البيانات إلى Pinecone
@@ -184,7 +57,7 @@ known_places_embedding = {
 for name, address in known_places_embedding.items():
     try:
         vector = get_embedding(name)
-        index.upsert([(f"place-{name}", vector, {"address": address})])
+        index.upsert([(f"place-{name}", vector, {"name": name, "address": address})], namespace=city.pinecone_namespace)
         print(f"✅ تم رفع: {name}")
         time.sleep(0.5)
     except Exception as e:
@@ -0,0 +1,106 @@
+# ================================
+# 🗂️ حالة جلسة الحجز
+# ================================
+# سجل بـ __slots__ بدل dict حر: بيخزن مراجع ومعرّفات بدل نسخ (رقم نوع السيارة
+# بدل كل الكتالوج، (place_id, الوصف) بدل نتائج البحث كاملة، والـ prompt ثابت
+# مشترك ما بينخزن بكل جلسة)، والـ history إلها حد أعلى.
+# to_dict / from_dict بيعطوا شكل JSON بسيط لتخزين الجلسات بمخزن خارجي.
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+MAX_HISTORY = 10
+
+# الخانات يلي قيمتها tuple (بترجع tuple بعد from_dict)
+_TUPLE_SLOTS = ("last_places", "possible_places", "possible_pickup_places", "car_type_ids")
+# خانات فيها كلام المستخدم أو عناوين أو موقعه، ما بتطلع كما هي بـ redacted_dict
+_TEXT_SLOTS = ("loc_txt", "dest_address", "pickup", "notes")
+_COORD_SLOTS = ("lat", "lng", "to_lat", "to_lng", "pickup_lat", "pickup_lng")
+
+
+def _redacted(text: str) -> str:
+    return f"<{len(text)} chars>"
+
+
+class Session:
+    __slots__ = (
+        "lat", "lng", "loc_txt", "step", "history", "last_places",
+        "possible_places", "dest_address", "to_lat", "to_lng",
+        "possible_pickup_places", "pickup", "pickup_lat", "pickup_lng",
+        "start_at", "car", "car_id", "car_type_ids", "audio", "notes",
+        "distance_km", "duration_min", "estimated_price", "city",
+    )
+
+    def __init__(self, lat: float, lng: float, loc_txt: str = "", step: str = "ask_destination"):
+        self.lat = lat
+        self.lng = lng
+        self.loc_txt = loc_txt
+        self.step = step
+        # (role, content) بدون رسالة الـ system (ASSISTANT_PROMPT مشترك)
+        self.history: List[Tuple[str, str]] = []
+        self.last_places: Tuple[str, ...] = ()
+        # (place_id, description) للخيارات يلي عرضناها
+        self.possible_places: Tuple[Tuple[str, str], ...] = ()
+        self.dest_address: Optional[str] = None
+        self.to_lat = 0.0
+        self.to_lng = 0.0
+        self.possible_pickup_places: Tuple[Tuple[str, str], ...] = ()
+        self.pickup: Optional[str] = None
+        self.pickup_lat = 0.0
+        self.pickup_lng = 0.0
+        self.start_at: Optional[str] = None
+        self.car: Optional[str] = None
+        self.car_id: Any = 1
+        # أرقام أنواع السيارات بنفس ترتيب القائمة يلي انعرضت للمستخدم
+        self.car_type_ids: Tuple[Any, ...] = ()
+        self.audio: Optional[str] = None
+        self.notes = ""
+        self.distance_km = 0.0
+        self.duration_min = 0.0
+        self.estimated_price = 0.0
+        # مفتاح المدينة من موقع بداية الجلسة (data/cities.json)، فاضي = الافتراضية
+        self.city = ""
+
+    def add_message(self, role: str, content: str):
+        self.history.append((role, content))
+        if len(self.history) > MAX_HISTORY:
+            del self.history[:-MAX_HISTORY]
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {}
+        for slot in self.__slots__:
+            value = getattr(self, slot)
+            if slot == "history" or slot in _TUPLE_SLOTS:
+                value = [list(v) if isinstance(v, tuple) else v for v in value]
+            data[slot] = value
+        return data
+
+    def redacted_dict(self) -> Dict[str, Any]:
+        # للتشخيص (turn_profiler): بدون نصوص المستخدم والعناوين والـ place_ids، والإحداثيات مقربة (~1 كم)
+        data = self.to_dict()
+        for slot in _COORD_SLOTS:
+            data[slot] = round(data[slot], 2)
+        for slot in _TEXT_SLOTS:
+            if data[slot]:
+                data[slot] = _redacted(data[slot])
+        data["history"] = [[role, _redacted(content)] for role, content in data["history"]]
+        data["last_places"] = [_redacted(p) for p in data["last_places"]]
+        for slot in ("possible_places", "possible_pickup_places"):
+            data[slot] = [[_redacted(place_id), _redacted(desc)] for place_id, desc in data[slot]]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Session":
+        sess = cls(data["lat"], data["lng"], data.get("loc_txt", ""), data.get("step", "ask_destination"))
+        for slot in cls.__slots__:
+            if slot not in data:
+                continue
+            value = data[slot]
+            if slot == "history":
+                value = [tuple(v) for v in value]
+            elif slot in _TUPLE_SLOTS:
+                value = tuple(tuple(v) if isinstance(v, list) else v for v in value)
+            setattr(sess, slot, value)
+        return sess
+
+
+def place_choices(places: Sequence[dict]) -> Tuple[Tuple[str, str], ...]:
+    return tuple((p["place_id"], p["description"]) for p in places)
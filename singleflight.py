@@ -0,0 +1,77 @@
+# ================================
+# 🛬 Single-flight: طلب خارجي واحد للاستعلامات المتطابقة المتزامنة
+# ================================
+# لما كذا مستخدم يطلبوا نفس الشي (نفس الوجهة مثلاً) بنفس اللحظة والكاش فاضي،
+# أول واحد بيعمل الطلب الخارجي والباقي بينطروا نتيجته (أو الخطأ) بدل ما يعيدوه.
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+_groups: Dict[str, "SingleFlight"] = {}
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executed = 0   # طلبات خارجية فعلية
+        self.coalesced = 0  # طلبات وفرناها لأنها انتظرت طلب شغال
+        self.shared_errors = 0
+        _groups[name] = self
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is not None:
+                    self.shared_errors += call.waiters
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "shared_errors": self.shared_errors,
+                "in_flight": len(self._calls),
+            }
+
+
+def all_stats() -> Dict[str, Dict[str, int]]:
+    return {name: group.stats() for name, group in _groups.items()}
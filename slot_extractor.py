@@ -0,0 +1,201 @@
+# ================================
+# 🧩 استخراج خانات الحجز من رسالة وحدة
+# ================================
+# قواعد بسيطة (regex مترجمة مسبقاً) بتطلع من رسالة متل
+#   "بدي روح عالبرامكة من موقعي بعد 10 دقايق VIP"
+# الوجهة، الانطلاق، الوقت، نوع السيارة، والصوت، مشان البوت يتجاوز الأسئلة
+# يلي انجاوبت. الوقت بيرجع كنص (متل "بعد 10 دقايق") وبينفهم بـ parse_time_from_user.
+import re
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence, Tuple
+
+NOW_WORDS = ("الآن", "الان", "هلق", "هلأ", "الحين", "فوراً", "فورا", "حالاً", "حالا")
+
+AFTER_MINUTES_RE = re.compile(r"بعد\s+(\d+)\s*دق(?:ي|ا|اي|ائ)ق[ةه]?")
+NOW_RE = re.compile(r"(?<!\S)(?:%s)(?!\S)" % "|".join(NOW_WORDS))
+CLOCK_RE = re.compile(
+    r"(?<!\S)(?:ع\s*|على\s+)?ال?ساع[ةه]\s*\d{1,2}(?:[:.]\d{2})?(?:\s*(?:صباحاً|صباحا|مساءً|مساء|ص|م|am|pm)(?!\S))?"
+)
+
+# الكلمة ممكن يجي قبلها ال/بال/لل/و ("شغلي القرآن"، "بالموسيقى") وبعدها علامة ("موسيقى؟")
+AUDIO_RE = re.compile(
+    r"(?<!\S)(?:(مع|بدون|بلا)\s+)?و?(?:بال|لل|ال|ب|ل)?"
+    r"(قرآن|قران|موسيقى|موسيقا|أغاني|اغاني|صوت|صمت|هدوء)(?=[\s،,.؛:؟?!]|$)"
+)
+AUDIO_VALUES = {
+    "قرآن": "قرآن", "قران": "قرآن",
+    "موسيقى": "موسيقى", "موسيقا": "موسيقى", "أغاني": "موسيقى", "اغاني": "موسيقى",
+    "صمت": "صمت", "هدوء": "صمت",
+}
+
+CURRENT_LOCATION_RE = re.compile(r"(?<!\S)من\s+(?:موقعي(?:\s+الحالي)?|الموقع\s+الحالي|مكاني|هون|هنا|عندي)(?!\S)")
+PICKUP_RE = re.compile(r"(?<!\S)من\s+(?=\S)")
+# "إلى/لعند" وجهة دايماً. "على/ع" بتجي بأسماء أماكن ("مطعم على الطريق"، "عالم الأطفال")
+# فما منعتبرها وجهة إلا بعد فعل حركة أو خانة تانية، أو ("على X") ببداية الرسالة
+DEST_RE = re.compile(r"(?<!\S)(?:(?P<to>إلى|الى|لعند)\s+|(?P<on>على|ع)\s+|(?P<attached>ع)(?=ال))")
+
+TRAVEL_VERBS = ("بدي", "بدّي", "وديني", "ودّيني", "خدني", "خذني", "وصلني", "أريد", "اريد", "رايح", "بروح",
+                "روح", "أروح", "اروح", "نروح", "الذهاب", "اطلع", "أطلع")
+AFTER_VERB_RE = re.compile(r"(?<!\S)(?:%s)$" % "|".join(TRAVEL_VERBS))
+# "قريب من X" وصف للمكان، مو انطلاق
+NEAR_WORDS_RE = re.compile(r"(?<!\S)(?:قريب|قريبة|جنب|حد|بعيد|مقابل|قبال|ورا|جهة)$")
+LEADING_VERBS_RE = re.compile(
+    r"^(?:أنا\s+)?(?:بدي|بدّي|وديني|ودّيني|خدني|خذني|وصلني|أريد|اريد|رايح|بروح)"
+    r"(?:\s+(?:روح|أروح|اروح|نروح|الذهاب|اطلع|أطلع))?\s*"
+)
+FILLERS_RE = re.compile(r"(?<!\S)(?:لو\s+سمحت|من\s+فضلك|رجاءً|رجاء|please)(?!\S)", re.IGNORECASE)
+TRIM_CHARS = " \t،,.؟?!-"
+
+
+class Slots:
+    __slots__ = ("destination", "pickup", "pickup_current", "time_text", "car_id", "car_name", "audio")
+
+    def __init__(self):
+        self.destination: Optional[str] = None
+        self.pickup: Optional[str] = None
+        self.pickup_current = False
+        self.time_text: Optional[str] = None
+        self.car_id: Any = None
+        self.car_name: Optional[str] = None
+        self.audio: Optional[str] = None
+
+    def extras(self) -> int:
+        # عدد الخانات غير الوجهة يلي لقيناها
+        return sum((
+            bool(self.pickup or self.pickup_current),
+            self.time_text is not None,
+            self.car_name is not None,
+            self.audio is not None,
+        ))
+
+
+@lru_cache(maxsize=32)
+def _car_re(names: Tuple[str, ...]):
+    if not names:
+        return None
+    alternatives = "|".join(re.escape(n) for n in sorted(names, key=len, reverse=True))
+    return re.compile(r"(?<!\S)(?:ب?سيار[ةه]\s+)?(%s)(?!\S)" % alternatives, re.IGNORECASE)
+
+
+def match_car(text: str, car_types: Sequence[Tuple[Any, str]]) -> Optional[Tuple[Tuple[Any, str], Tuple[int, int]]]:
+    # car_types: [(Id, Ar_Name)] ← بيرجع ((Id, Ar_Name), span)
+    pattern = _car_re(tuple(name for _, name in car_types if name))
+    m = pattern.search(text) if pattern else None
+    if not m:
+        return None
+    found = m.group(1).lower()
+    for car_id, name in car_types:
+        if name and name.lower() == found:
+            return (car_id, name), m.span()
+    return None
+
+
+def match_audio(text: str) -> Optional[str]:
+    m = AUDIO_RE.search(text)
+    return _audio_value(m) if m else None
+
+
+def _audio_value(m) -> Optional[str]:
+    if m.group(1) in ("بدون", "بلا"):
+        return "صمت"
+    return AUDIO_VALUES.get(m.group(2))
+
+
+def _inside(pos: int, spans: List[Tuple[int, int]]) -> bool:
+    return any(s <= pos < e for s, e in spans)
+
+
+def _first_outside(pattern, text: str, spans: List[Tuple[int, int]]):
+    # أول تطابق مو جوا خانة لقيناها قبل (متل "على" بـ "على الساعة 8")
+    for m in pattern.finditer(text):
+        if not _inside(m.start(), spans):
+            return m
+    return None
+
+
+def _after_verb(text: str, pos: int) -> bool:
+    return AFTER_VERB_RE.search(text[:pos].rstrip()) is not None
+
+
+def _after_slot(text: str, pos: int, spans: List[Tuple[int, int]]) -> bool:
+    return any(e <= pos and not text[e:pos].strip() for _, e in spans)
+
+
+def _dest_ok(m, text: str, spans: List[Tuple[int, int]]) -> bool:
+    if m.group("to"):
+        return True
+    if m.group("on") and m.start() == 0:
+        return True
+    return _after_verb(text, m.start()) or _after_slot(text, m.start(), spans)
+
+
+def _segment(text: str, start: int, spans: List[Tuple[int, int]]) -> Optional[str]:
+    # النص من start لحد بداية أول خانة تانية بعده
+    end = min([s for s, _ in spans if s >= start] + [len(text)])
+    value = text[start:end].strip(TRIM_CHARS)
+    return value or None
+
+
+def extract_slots(text: str, car_types: Sequence[Tuple[Any, str]] = ()) -> Slots:
+    slots = Slots()
+    text = " ".join(FILLERS_RE.sub(" ", text).split())
+    spans: List[Tuple[int, int]] = []
+
+    for pattern in (AFTER_MINUTES_RE, CLOCK_RE, NOW_RE):
+        m = pattern.search(text)
+        if m:
+            slots.time_text = m.group(0).strip()
+            spans.append(m.span())
+            break
+
+    car = match_car(text, car_types)
+    if car:
+        (slots.car_id, slots.car_name), span = car
+        spans.append(span)
+
+    m = AUDIO_RE.search(text)
+    if m and _audio_value(m):
+        slots.audio = _audio_value(m)
+        spans.append(m.span())
+
+    m = _first_outside(CURRENT_LOCATION_RE, text, spans)
+    if m:
+        slots.pickup_current = True
+        spans.append(m.span())
+
+    # "من X" انطلاق بس إذا إجت بعد فعل حركة أو جنب علامة الوجهة ("من الميدان
+    # عالبرامكة"، "عالبرامكة من الميدان")، غير هيك جزء من اسم المكان ("قريب من الجامع")
+    dests = [d for d in DEST_RE.finditer(text) if not _inside(d.start(), spans)]
+    pickup_marker = dest_marker = None
+    if not slots.pickup_current:
+        for p in PICKUP_RE.finditer(text):
+            if _inside(p.start(), spans):
+                continue
+            nxt = next((d for d in dests if d.start() >= p.end()), None)
+            if nxt is not None and any(p.end() <= s < nxt.start() for s, _ in spans):
+                nxt = None
+            if nxt is not None or _after_verb(text, p.start()):
+                pickup_marker, dest_marker = p, nxt
+                spans.append(p.span())
+                break
+
+    if dest_marker is None:
+        dest_marker = next((d for d in dests if not _inside(d.start(), spans) and _dest_ok(d, text, spans)), None)
+        if dest_marker and not slots.pickup_current:
+            for p in PICKUP_RE.finditer(text, dest_marker.end()):
+                if not _inside(p.start(), spans) and not NEAR_WORDS_RE.search(text[:p.start()].rstrip()):
+                    pickup_marker = p
+                    spans.append(p.span())
+                    break
+    if dest_marker:
+        spans.append(dest_marker.span())
+
+    if pickup_marker:
+        slots.pickup = _segment(text, pickup_marker.end(), spans)
+    if dest_marker:
+        slots.destination = _segment(text, dest_marker.end(), spans)
+    else:
+        # بدون "على/إلى": الوجهة هي يلي بيضل قبل أول خانة بعد شيل "بدي روح"
+        head = LEADING_VERBS_RE.sub("", text[:min([s for s, _ in spans] + [len(text)])])
+        slots.destination = head.strip(TRIM_CHARS) or None
+    return slots
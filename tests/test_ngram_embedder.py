@@ -0,0 +1,27 @@
+# tier 0 ما لازم يقبل مكان ناقصه كلمة من الاستعلام ("مول قاسيون" ← "قاسيون")
+import pytest
+
+from ngram_embedder import NgramEmbedder, NgramIndex
+
+
+@pytest.fixture(scope="module")
+def index():
+    return NgramIndex(["قاسيون", "سوق الجمرك", "كفرسوسة البلد", "البرامكة"], NgramEmbedder(stop_words=["دمشق"]))
+
+
+@pytest.mark.parametrize("query, name", [
+    ("مول قاسيون", "قاسيون"),
+    ("دوار كفرسوسة", "كفرسوسة البلد"),
+])
+def test_coverage_rejects_extra_words(index, query, name):
+    assert index.coverage(query, name) < 1.0
+
+
+@pytest.mark.parametrize("query, name", [
+    ("برامكة", "البرامكة"),
+    ("سوقالجمرك", "سوق الجمرك"),
+    ("سقو الجمرك", "سوق الجمرك"),
+    ("كفرسوسة دمشق", "كفرسوسة البلد"),
+])
+def test_coverage_accepts_typos(index, query, name):
+    assert index.coverage(query, name) == 1.0
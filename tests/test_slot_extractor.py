@@ -0,0 +1,69 @@
+# جواب خطوة ask_audio: الكلمة مع ال/بال/لل وعلامات الترقيم لازم تنفهم متل ما كانت
+import pytest
+
+from slot_extractor import extract_slots, match_audio
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("قرآن", "قرآن"),
+    ("القرآن", "قرآن"),
+    ("شغلي القرآن", "قرآن"),
+    ("القران الكريم", "قرآن"),
+    ("موسيقى", "موسيقى"),
+    ("بالموسيقى", "موسيقى"),
+    ("موسيقى؟", "موسيقى"),
+    ("مع الموسيقى.", "موسيقى"),
+    ("الأغاني", "موسيقى"),
+    ("واغاني", "موسيقى"),
+    ("بدون موسيقى", "صمت"),
+    ("بلا الأغاني", "صمت"),
+    ("هدوء لو سمحت", "صمت"),
+    ("ولا شي", None),
+    ("الصوتيات", None),
+])
+def test_match_audio(text, expected):
+    assert match_audio(text) == expected
+
+
+def test_extract_slots_audio_with_article():
+    slots = extract_slots("بدي روح عالبرامكة من موقعي هلق مع القرآن")
+    assert slots.destination == "البرامكة"
+    assert slots.pickup_current
+    assert slots.time_text == "هلق"
+    assert slots.audio == "قرآن"
+
+
+def test_extract_slots_pickup_and_destination():
+    slots = extract_slots("بدي روح من الميدان عالبرامكة بعد 10 دقايق")
+    assert slots.pickup == "الميدان"
+    assert slots.destination == "البرامكة"
+    assert slots.time_text == "بعد 10 دقايق"
+
+
+# "ع/على" و"من" جوا اسم المكان ما لازم يتقطعوا
+@pytest.mark.parametrize("text", [
+    "عالم الأطفال",
+    "مطعم على الطريق",
+    "قريب من الجامع الأموي",
+    "مقابل المدرسة من جهة الشرق",
+])
+def test_extract_slots_keeps_place_names(text):
+    slots = extract_slots(text)
+    assert slots.destination == text
+    assert slots.pickup is None
+    assert not slots.extras()
+
+
+def test_extract_slots_marker_after_verb_only():
+    slots = extract_slots("بدي روح على مطعم على الطريق")
+    assert slots.destination == "مطعم على الطريق"
+    slots = extract_slots("بدي روح عالحميدية قريب من الجامع الأموي")
+    assert slots.destination == "الحميدية قريب من الجامع الأموي"
+    assert slots.pickup is None
+
+
+def test_extract_slots_pickup_after_destination():
+    slots = extract_slots("وديني عالبرامكة من الميدان VIP", [(2, "VIP")])
+    assert slots.destination == "البرامكة"
+    assert slots.pickup == "الميدان"
+    assert slots.car_id == 2
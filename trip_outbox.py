@@ -0,0 +1,292 @@
+# ================================
+# 📮 Outbox لطلبات إنشاء الرحلات
+# ================================
+# الطلب بينحفظ أولاً بملف SQLite محلي، وبعدين workers بالخلفية بيبعتوه لـ API
+# الحجز مع Idempotency-Key ثابت، وإعادة محاولة مع backoff، وتجميع بدفعات إذا
+# الـ backend بيدعم هالشي. هيك المستخدم ما بينطر الـ backend ولا بيضيع الحجز لو فشل.
+# كذا عملية (uvicorn workers) بتشارك نفس الملف: كل طلب بيتحجز بـ UPDATE واحد
+# (ذري بـ SQLite) مع lease، وإذا العملية ماتت وهي عم تبعت، الطلب بيرجع بس لما
+# يخلص الـ lease تبعه، مش كل ما عملية تانية تقلع.
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+STATUS_PENDING = "pending"
+STATUS_SENDING = "sending"
+STATUS_CONFIRMED = "confirmed"
+STATUS_REJECTED = "rejected"
+STATUS_FAILED = "failed"
+
+FINAL_STATUSES = {STATUS_CONFIRMED, STATUS_REJECTED, STATUS_FAILED}
+
+_OUTBOX_NAMESPACE = uuid.UUID("6f1c2b0e-9d4a-4c55-9a57-3b8e7f0d2a11")
+
+
+def trip_key_for_session(session_id: str) -> str:
+    # نفس الجلسة دايماً بتعطي نفس المفتاح، فالتأكيد المكرر ما بيعمل رحلتين
+    return str(uuid.uuid5(_OUTBOX_NAMESPACE, session_id))
+
+
+class TripOutbox:
+    def __init__(
+        self,
+        path: str,
+        submit_url: str,
+        headers: Dict[str, str],
+        batch_url: str = "",
+        workers: int = 2,
+        batch_size: int = 20,
+        max_attempts: int = 8,
+        base_delay: float = 2.0,
+        max_delay: float = 300.0,
+        timeout: float = 10.0,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 0.0,
+    ):
+        self.path = path
+        self.submit_url = submit_url
+        self.batch_url = batch_url
+        self.headers = headers
+        self.workers = workers
+        self.batch_size = batch_size if batch_url else 1
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        # لازم يكون أطول من أطول إرسال، غير هيك عملية تانية بتحجز الطلب وهو عم ينبعت
+        self.lease_seconds = lease_seconds or max(60.0, self.timeout * 3)
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._stopping = False
+        self._threads: List[threading.Thread] = []
+        self._listeners: Dict[str, List[Callable[[dict], None]]] = {}
+        # الملف بيفتح بـ start() (startup السيرفر)، مش وقت إنشاء الـ object
+        self._db: Optional[sqlite3.Connection] = None
+
+    # ---------------- واجهة الـ chatbot ----------------
+    def enqueue(self, payload: dict, trip_id: Optional[str] = None) -> str:
+        trip_id = trip_id or str(uuid.uuid4())
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO trips (id, payload, status, next_attempt_at, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (trip_id, json.dumps(payload, ensure_ascii=False), STATUS_PENDING, now, now, now),
+            )
+            self._wakeup.notify()
+        return trip_id
+
+    def status(self, trip_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, status, attempts, last_error, response, created_at, updated_at FROM trips WHERE id = ?",
+                (trip_id,),
+            ).fetchone()
+        if not row:
+            return None
+        return self._row_to_status(row)
+
+    def add_listener(self, trip_id: str, callback: Callable[[dict], None]):
+        # بينادى مرة وحدة لما توصل الرحلة لحالة نهائية
+        with self._lock:
+            self._listeners.setdefault(trip_id, []).append(callback)
+        current = self.status(trip_id)
+        if current and current["status"] in FINAL_STATUSES:
+            self._notify(trip_id)
+
+    def remove_listener(self, trip_id: str, callback: Callable[[dict], None]):
+        # مثلاً الاتصال يلي كان ناطر النتيجة سكّر
+        with self._lock:
+            callbacks = self._listeners.get(trip_id)
+            if callbacks and callback in callbacks:
+                callbacks.remove(callback)
+                if not callbacks:
+                    del self._listeners[trip_id]
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM trips GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    # ---------------- الـ workers ----------------
+    def open(self):
+        if self._db is not None:
+            return
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS trips (
+                id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                last_error TEXT,
+                response TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                claimed_by TEXT,
+                lease_until REAL NOT NULL DEFAULT 0
+            )
+            """
+        )
+        # ملفات outbox أقدم من الـ lease: الطلبات العالقة بـ sending بتاخد lease_until = 0 فبترجع
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(trips)")}
+        if "claimed_by" not in columns:
+            self._db.execute("ALTER TABLE trips ADD COLUMN claimed_by TEXT")
+        if "lease_until" not in columns:
+            self._db.execute("ALTER TABLE trips ADD COLUMN lease_until REAL NOT NULL DEFAULT 0")
+        self._db.execute("CREATE INDEX IF NOT EXISTS trips_due ON trips (status, next_attempt_at)")
+
+    def start(self):
+        self.open()
+        self._stopping = False
+        for i in range(self.workers):
+            t = threading.Thread(target=self._worker_loop, name=f"trip-outbox-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: float = 5.0):
+        with self._lock:
+            self._stopping = True
+            self._wakeup.notify_all()
+        for t in self._threads:
+            t.join(timeout=timeout)
+        self._threads = []
+
+    def _worker_loop(self):
+        while True:
+            with self._lock:
+                if self._stopping:
+                    return
+                batch = self._claim_due()
+                if not batch:
+                    self._wakeup.wait(timeout=self.poll_interval)
+                    continue
+            try:
+                if self.batch_url and len(batch) > 1:
+                    self._submit_batch(batch)
+                else:
+                    for trip_id, payload, attempts in batch:
+                        self._submit_one(trip_id, payload, attempts)
+            except Exception as e:
+                for trip_id, _, attempts in batch:
+                    self._mark_retry(trip_id, attempts, str(e))
+
+    def _claim_due(self):
+        # لازم ينادى والقفل ماسك. الاختيار والحجز بنفس الـ statement، فعمليتين ما
+        # بيحجزوا نفس الطلب؛ وطلب sending خلص الـ lease تبعه (العملية يلي حجزته ماتت) بيرجع
+        now = time.time()
+        rows = self._db.execute(
+            "UPDATE trips SET status = ?, claimed_by = ?, lease_until = ?, updated_at = ?"
+            " WHERE id IN (SELECT id FROM trips"
+            "  WHERE (status = ? AND next_attempt_at <= ?) OR (status = ? AND lease_until < ?)"
+            "  ORDER BY next_attempt_at LIMIT ?)"
+            " RETURNING id, payload, attempts",
+            (STATUS_SENDING, self.owner, now + self.lease_seconds, now,
+             STATUS_PENDING, now, STATUS_SENDING, now, self.batch_size),
+        ).fetchall()
+        return [(r[0], json.loads(r[1]), r[2]) for r in rows]
+
+    def _submit_one(self, trip_id: str, payload: dict, attempts: int):
+        headers = {**self.headers, "Idempotency-Key": trip_id}
+        try:
+            resp = requests.post(self.submit_url, json=payload, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            self._mark_retry(trip_id, attempts, str(e))
+            return
+        self._handle_response(trip_id, attempts, resp.status_code, _safe_json(resp))
+
+    def _submit_batch(self, batch):
+        trips = [{**payload, "Idempotency_Key": trip_id} for trip_id, payload, _ in batch]
+        try:
+            resp = requests.post(self.batch_url, json={"trips": trips}, headers=self.headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            for trip_id, _, attempts in batch:
+                self._mark_retry(trip_id, attempts, str(e))
+            return
+        body = _safe_json(resp)
+        results = body.get("results") if isinstance(body.get("results"), list) else None
+        if resp.status_code >= 500 or results is None or len(results) != len(batch):
+            for trip_id, _, attempts in batch:
+                self._mark_retry(trip_id, attempts, body.get("message") or f"HTTP {resp.status_code}")
+            return
+        for (trip_id, _, attempts), result in zip(batch, results):
+            self._handle_response(trip_id, attempts, resp.status_code, result if isinstance(result, dict) else {})
+
+    def _handle_response(self, trip_id: str, attempts: int, status_code: int, body: dict):
+        if body.get("success") == True:
+            self._mark_final(trip_id, STATUS_CONFIRMED, attempts + 1, None, body)
+        elif status_code >= 500 or status_code in (408, 425, 429) or not body:
+            self._mark_retry(trip_id, attempts, body.get("message") or f"HTTP {status_code}")
+        else:
+            # رفض صريح من الـ backend (بيانات غلط مثلاً): ما في فايدة من الإعادة
+            self._mark_final(trip_id, STATUS_REJECTED, attempts + 1, body.get("message"), body)
+
+    def _mark_retry(self, trip_id: str, attempts: int, error: str):
+        attempts += 1
+        if attempts >= self.max_attempts:
+            self._mark_final(trip_id, STATUS_FAILED, attempts, error, None)
+            return
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+        delay = random.uniform(delay / 2, delay)
+        with self._lock:
+            self._db.execute(
+                "UPDATE trips SET status = ?, attempts = ?, last_error = ?, next_attempt_at = ?, updated_at = ?,"
+                " claimed_by = NULL, lease_until = 0 WHERE id = ?",
+                (STATUS_PENDING, attempts, error, time.time() + delay, time.time(), trip_id),
+            )
+
+    def _mark_final(self, trip_id: str, status: str, attempts: int, error: Optional[str], response: Optional[dict]):
+        with self._lock:
+            self._db.execute(
+                "UPDATE trips SET status = ?, attempts = ?, last_error = ?, response = ?, updated_at = ?,"
+                " claimed_by = NULL, lease_until = 0 WHERE id = ?",
+                (status, attempts, error, json.dumps(response, ensure_ascii=False) if response else None,
+                 time.time(), trip_id),
+            )
+        self._notify(trip_id)
+
+    def _notify(self, trip_id: str):
+        with self._lock:
+            callbacks = self._listeners.pop(trip_id, [])
+        if not callbacks:
+            return
+        current = self.status(trip_id)
+        for cb in callbacks:
+            try:
+                cb(current)
+            except Exception as e:
+                print("خطأ في إشعار حالة الرحلة:", e)
+
+    @staticmethod
+    def _row_to_status(row) -> dict:
+        trip_id, status, attempts, last_error, response, created_at, updated_at = row
+        return {
+            "tripId": trip_id,
+            "status": status,
+            "attempts": attempts,
+            "message": last_error,
+            "response": json.loads(response) if response else None,
+            "createdAt": created_at,
+            "updatedAt": updated_at,
+        }
+
+
+def _safe_json(resp) -> dict:
+    try:
+        data = resp.json()
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
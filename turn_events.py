@@ -0,0 +1,29 @@
+# ================================
+# 📡 أحداث الدور الحالي (push للعميل)
+# ================================
+# منطق المحادثة ما بيعرف مين عم يسمع: emit() بتبعت الحدث للـ sink المربوط
+# بالدور الحالي (contextvar). الـ WebSocket بيربط sink بيبعت الحدث عالاتصال
+# فوراً (نتائج البحث أول ما توصل)، وبالـ HTTP ما في sink فالحدث بينرمى.
+# الـ sink لازم يكون thread-safe: الأحداث بتطلع من threads الـ turn والـ slot_pool.
+import contextvars
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+EventSink = Callable[[dict], None]
+
+_current_sink: contextvars.ContextVar[Optional[EventSink]] = contextvars.ContextVar("event_sink", default=None)
+
+
+@contextmanager
+def event_sink(sink: EventSink):
+    token = _current_sink.set(sink)
+    try:
+        yield
+    finally:
+        _current_sink.reset(token)
+
+
+def emit(event_type: str, **data):
+    sink = _current_sink.get()
+    if sink is not None:
+        sink({"type": event_type, **data})
@@ -0,0 +1,209 @@
+# ================================
+# 🩺 تشخيص الأدوار البطيئة: sampling profiler + سجل الأدوار البطيئة
+# ================================
+# SamplingProfiler: بياخد لقطة من stacks كل الـ threads كل interval
+# (sys._current_frames، بدون tracing لكل استدعاء فالكلفة قليلة) لمدة محددة،
+# وبيرجع النتيجة بصيغة folded ("frame;frame;frame count") يلي بتفتح مباشرة
+# بـ flamegraph.pl أو speedscope.
+#
+# TurnLog: كل دور بالمحادثة إلو trace بـ contextvar، والاستدعاءات الخارجية
+# (Google، OpenAI، Pinecone، API السيارات) بتسجل حالها فيه عن طريق upstream().
+# إذا الدور طوّل أكتر من threshold_ms أو وقع فيه exception، منحفظ الخطوة
+# والاستدعاءات وتوقيتها ونسخة من الجلسة بدون بيانات شخصية بـ ring buffer محدود.
+# رسائل الأخطاء بتنحفظ بدون query strings: أخطاء requests فيها رابط Google كامل
+# (key=GOOGLE_MAPS_API_KEY وعنوان المستخدم)، والـ traceback frames بس بدون الرسالة.
+import contextvars
+import os
+import re
+import sys
+import threading
+import time
+import traceback
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+# أعلى frame بالـ stack هون معناها الـ thread نايم/عم ينطر، ما منعدها إلا إذا انطلبت
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("threading.py", "_acquire_restore"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("connection.py", "wait"),
+}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.01, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.samples = 0
+        self.stacks: Counter = Counter()
+
+    def _sample(self, own_ident: int, names: Dict[int, str]):
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            code = frame.f_code
+            if not self.include_idle and (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(ident, f"thread-{ident}"))
+            self.stacks[";".join(reversed(labels))] += 1
+        self.samples += 1
+
+    def run(self, seconds: float) -> str:
+        # بيشتغل بالـ thread يلي ناداه (endpoint sync)، وما بيصور حاله
+        own_ident = threading.get_ident()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            self._sample(own_ident, names)
+            time.sleep(self.interval)
+        return self.folded()
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+# ---------------- trace الدور الحالي ----------------
+class TurnTrace:
+    __slots__ = ("session_id", "step", "session", "started", "calls", "error")
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.step: Optional[str] = None
+        self.session = None
+        self.started = time.perf_counter()
+        self.calls: List[Dict[str, Any]] = []
+        self.error: Optional[Dict[str, str]] = None
+
+
+_current_turn: contextvars.ContextVar[Optional[TurnTrace]] = contextvars.ContextVar("current_turn", default=None)
+
+
+@contextmanager
+def upstream(name: str):
+    # بيسجل مدة الاستدعاء الخارجي بالـ trace الحالي (إذا في)، والمنادي فيه يضيف
+    # حقول عالـ dict (مثلاً shed لما الحصة ترفض الطلب)
+    call: Dict[str, Any] = {"name": name}
+    trace = _current_turn.get()
+    if trace is None:
+        yield call
+        return
+    t0 = time.perf_counter()
+    call["at_ms"] = round((t0 - trace.started) * 1000, 1)
+    call["ok"] = False
+    try:
+        yield call
+        call["ok"] = True
+    finally:
+        call["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        trace.calls.append(call)
+
+
+def note_turn(step: Optional[str] = None, session=None):
+    trace = _current_turn.get()
+    if trace is not None:
+        if step is not None:
+            trace.step = step
+        if session is not None:
+            trace.session = session
+
+
+_URL_RE = re.compile(r"(https?://[^\s?'\"<>]+)\?[^\s'\"<>]*")
+_QUERY_RE = re.compile(r"[?&][\w.\-\[\]]+=[^\s'\"<>]*")
+
+
+def redact_message(text: str, limit: int = 300) -> str:
+    text = _URL_RE.sub(r"\1?<redacted>", text)
+    text = _QUERY_RE.sub("<redacted>", text)
+    return text[:limit]
+
+
+def describe_error(exc: BaseException) -> str:
+    return f"{type(exc).__name__}: {redact_message(str(exc))}"
+
+
+def record_error(exc: BaseException) -> str:
+    # بيرجع رقم قصير للخطأ، بينعرض للمستخدم وبنلاقيه بـ /admin/slow-turns
+    error_id = uuid.uuid4().hex[:8]
+    trace = _current_turn.get()
+    if trace is not None:
+        trace.error = {
+            "id": error_id,
+            "type": type(exc).__name__,
+            "message": redact_message(str(exc)),
+            "traceback": [f"{os.path.basename(f.filename)}:{f.lineno} {f.name}"
+                          for f in traceback.extract_tb(exc.__traceback__)],
+        }
+    return error_id
+
+
+class TurnLog:
+    def __init__(self, threshold_ms: float = 2000.0, capacity: int = 100):
+        self.threshold_ms = threshold_ms
+        self._records: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.turns = 0
+        self.captured = 0
+        self.errors = 0
+
+    @contextmanager
+    def turn(self, session_id: Optional[str]):
+        trace = TurnTrace(session_id or "")
+        token = _current_turn.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_turn.reset(token)
+            elapsed_ms = (time.perf_counter() - trace.started) * 1000
+            slow = elapsed_ms >= self.threshold_ms
+            with self._lock:
+                self.turns += 1
+                self.errors += trace.error is not None
+            if slow or trace.error is not None:
+                self._capture(trace, elapsed_ms, slow)
+
+    def _capture(self, trace: TurnTrace, elapsed_ms: float, slow: bool):
+        record = {
+            "at": time.time(),
+            "session_id": trace.session_id,
+            "step": trace.step,
+            "ms": round(elapsed_ms, 1),
+            "slow": slow,
+            "calls": sorted(trace.calls, key=lambda c: c.get("at_ms", 0)),
+            "upstream_ms": round(sum(c.get("ms", 0) for c in trace.calls), 1),
+            "session": trace.session.redacted_dict() if trace.session is not None else None,
+            "error": trace.error,
+        }
+        with self._lock:
+            self._records.append(record)
+            self.captured += 1
+
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        # الأحدث أولاً
+        with self._lock:
+            records = list(self._records)
+        return records[::-1][:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "threshold_ms": self.threshold_ms,
+                "turns": self.turns,
+                "captured": self.captured,
+                "errors": self.errors,
+                "buffered": len(self._records),
+            }